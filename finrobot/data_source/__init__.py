@@ -1,8 +1,97 @@
-import importlib.util
-from .openweatherapi_utils import OpenWeatherAPI
-from .weatherapi_utils import WeatherAPIUtils
-from .soil_data_util import AgriInfoService
-from .solar_wind_utils import SolarWind
+import os as _os
+import sys as _sys
+from importlib import import_module as _import_module
+from importlib.util import find_spec as _find_spec
+import typing as _typing
 
+if _typing.TYPE_CHECKING:
+    from .finnhub_utils import FinnHubUtils
+    from .yfinance_utils import YFinanceUtils
+    from .fmp_utils import FMPUtils
+    from .sec_utils import SECUtils
+    from .reddit_utils import RedditUtils
+    from .finnlp_utils import FinNLPUtils
+    from .openweatherapi_utils import OpenWeatherAPI
+    from .weatherapi_utils import WeatherAPIUtils
+    from .soil_data_util import AgriInfoService
+    from .solar_wind_utils import SolarWind
 
-__all__ = ["WeatherAPIUtils","WeatherAnalysisInsights","AgriInfoService","OpenWeatherAPI","SolarWind"]
+# The submodule shares the model's name, so the model is bound eagerly: a
+# lazy name would be shadowed by the submodule itself whenever something
+# (reportWeather) imports finrobot.data_source.WeatherAnalysisInsights first.
+# It only defines this pydantic model, so there is nothing to defer anyway.
+from .WeatherAnalysisInsights import WeatherAnalysisInsights
+
+# Name -> submodule. Submodules are only imported on first attribute access,
+# so a script that only needs one utility doesn't pay for the others.
+# Module-level side effects (load_dotenv(), the OpenAI clients in
+# soil_data_util / solar_wind_utils) therefore also run on first access only;
+# a module must not rely on a sibling having been imported to set them up.
+# _PUBLIC and WeatherAnalysisInsights are what
+# `from finrobot.data_source import *` exports.
+_PUBLIC = {
+    "WeatherAPIUtils": ".weatherapi_utils",
+    "AgriInfoService": ".soil_data_util",
+    "OpenWeatherAPI": ".openweatherapi_utils",
+    "SolarWind": ".solar_wind_utils",
+}
+
+# Finance utilities carried over from FinRobot: importable by name, but kept
+# out of `import *` so the weather agents don't need their API clients.
+_FINANCE = {
+    "FinnHubUtils": ".finnhub_utils",
+    "YFinanceUtils": ".yfinance_utils",
+    "FMPUtils": ".fmp_utils",
+    "SECUtils": ".sec_utils",
+    "RedditUtils": ".reddit_utils",
+    "FinNLPUtils": ".finnlp_utils",
+}
+
+_lazy_imports = {**_PUBLIC, **_FINANCE}
+
+__all__ = ("WeatherAnalysisInsights", *_PUBLIC)
+
+# finnlp is optional; probed once, on first reference to FinNLPUtils
+_finnlp_available = None
+
+
+def _has_finnlp():
+    global _finnlp_available
+    if _finnlp_available is None:
+        _finnlp_available = _find_spec("finnlp") is not None
+    return _finnlp_available
+
+
+def __getattr__(name):
+    modpath = _lazy_imports.get(name)
+    if modpath is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if name == "FinNLPUtils" and not _has_finnlp():
+        raise AttributeError("FinNLPUtils requires the optional 'finnlp' package")
+    # The submodule may already be loaded by a direct import or a sibling
+    # (sec_utils imports fmp_utils); skip the import machinery then
+    module = _sys.modules.get(__name__ + modpath)
+    if module is None:
+        module = _import_module(modpath, __name__)
+    attr = getattr(module, name)
+    # Cache in the module dict so later lookups skip __getattr__ entirely
+    globals()[name] = attr
+    return attr
+
+
+def __dir__():
+    # Built on every call: importing a submodule adds it to the package's
+    # globals, so a memoized listing would go stale
+    names = set(globals()) | set(_lazy_imports)
+    if not _has_finnlp():
+        names.discard("FinNLPUtils")
+    return sorted(names)
+
+
+# FINROBOT_EAGER_IMPORT=1 resolves every exported name up front, so circular
+# imports hidden by the lazy wiring fail at package import instead of on a
+# specific user code path.
+if _os.environ.get("FINROBOT_EAGER_IMPORT") == "1":
+    for _name in _PUBLIC:
+        __getattr__(_name)
+    del _name
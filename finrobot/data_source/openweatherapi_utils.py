@@ -1,10 +1,31 @@
+import copy
+import json
+import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
 import math
 import time
-import statistics
+import threading
+import shutil
+from collections import defaultdict
+from heapq import nsmallest
+from cachetools import TTLCache
 from datetime import datetime, timedelta
 from typing import Optional, Tuple, Dict, Any, List, Union
-from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlencode, urlsplit, parse_qs
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _json_loads = json.loads
+
+try:
+    import ijson as _ijson
+except ImportError:  # ijson is optional; long history ranges are then parsed whole
+    _ijson = None
 
 WEATHER_CODE_MAP = {
     # Thunderstorm Group 2xx
@@ -77,33 +98,266 @@ WEATHER_CODE_MAP = {
     804: 'Overcast clouds (85–100%)'
 }
 
+# AQI description mapper
+AQI_DESCRIPTIONS = {
+    1: "Good",
+    2: "Fair",
+    3: "Moderate",
+    4: "Poor",
+    5: "Very Poor"
+}
+
+# Air pollution component names
+COMPONENT_DESCRIPTIONS = {
+    'co': 'Carbon monoxide',
+    'no': 'Nitrogen monoxide',
+    'no2': 'Nitrogen dioxide',
+    'o3': 'Ozone',
+    'so2': 'Sulphur dioxide',
+    'pm2_5': 'Fine particles (PM2.5)',
+    'pm10': 'Coarse particles (PM10)',
+    'nh3': 'Ammonia'
+}
+
+# Bound once so per-item lookups skip the global and attribute resolution
+_weather_desc = WEATHER_CODE_MAP.get
+
+# (connect, read) timeout in seconds for every OpenWeather request
+REQUEST_TIMEOUT = (3, 10)
+
+# History ranges longer than this are stream-parsed when ijson is installed
+STREAM_MIN_RANGE = 7 * 86400
+
+
+def _api_key() -> str:
+    """
+    The OpenWeather API key from OWM_API_KEY. It is read on every request,
+    so keys registered after import (e.g. via register_keys_from_json) apply.
+    """
+    api_key = os.environ.get("OWM_API_KEY")
+    if not api_key:
+        raise ValueError("Please set the environment variable OWM_API_KEY to use the OpenWeather API.")
+    return api_key
+
+
+class _AppIdAuth(requests.auth.AuthBase):
+    """Adds the API key as the appid query parameter of each request, so callers' params dicts are never modified."""
+
+    def __call__(self, request):
+        # Tile URLs from get_weather_map_url already carry it
+        if 'appid' not in parse_qs(urlsplit(request.url).query):
+            request.prepare_url(request.url, {'appid': _api_key()})
+        return request
+
+
+def _create_session() -> requests.Session:
+    """Creates a pooled session so repeated calls reuse the same TCP/TLS connection."""
+    session = requests.Session()
+    session.auth = _AppIdAuth()
+    # Every encoding urllib3 can decode here: adds br (and zstd) when the
+    # brotli (zstandard) package is installed, which shrinks large history
+    # responses well beyond gzip
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    # Transient rate limiting and gateway errors are retried with backoff;
+    # once retries run out the last response is returned, not raised
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 502, 503, 504),
+                  allowed_methods=("GET",), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_session = _create_session()
+
+# Seconds a cached response stays fresh. Coordinates practically never change;
+# observations and forecasts are refreshed by OpenWeather every few minutes.
+CACHE_TTLS = {
+    'geocode': 24 * 3600,
+    'weather': 10 * 60,
+    'forecast': 60 * 60,
+    'forecast/daily': 60 * 60,
+    'air_pollution': 15 * 60,
+}
+_caches = {name: TTLCache(maxsize=512, ttl=ttl) for name, ttl in CACHE_TTLS.items()}
+_cache_lock = threading.Lock()
+# Cacheable requests currently being made, keyed like _caches entries, so a
+# concurrent identical request (get_weather_bundle's hourly summary and its
+# daily fallback both read 'forecast') waits for the response instead of
+# sending its own
+_in_flight: Dict[Tuple[str, tuple], threading.Event] = {}
+
+
+def _cache_get(name: str, key: tuple) -> Any:
+    with _cache_lock:
+        return _caches[name].get(key)
+
+
+def _cache_set(name: str, key: tuple, value: Any) -> None:
+    # Failed lookups return None and are never cached, so they get retried
+    if value is not None:
+        with _cache_lock:
+            _caches[name][key] = value
+
+
+# Naive datetimes for interval labels are built from local-time epoch seconds
+_EPOCH = datetime(1970, 1, 1)
+# Indexed by (days since _EPOCH + 3) % 7; 1970-01-01 was a Thursday
+_WEEKDAYS = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+
+def _utc_offset(timestamp: int) -> int:
+    """Seconds the local timezone is ahead of UTC at the given Unix time."""
+    return time.localtime(timestamp).tm_gmtoff
+
+
+# Spacing of the offset checks inside a range. Equal offsets at both ends
+# don't rule out a change and its reversal in between (a history range
+# spanning a whole DST season), but a local offset holds for weeks at least,
+# so checking once a week catches both.
+_OFFSET_PROBE_STEP = 7 * 86400
+
+
+def _range_offset(first: int, last: int) -> Optional[int]:
+    """
+    UTC offset shared by every time between first and last, or None if a DST
+    change falls between them and offsets must be looked up per item.
+    """
+    offset = _utc_offset(first)
+    for probe in range(int(first) + _OFFSET_PROBE_STEP, int(last), _OFFSET_PROBE_STEP):
+        if _utc_offset(probe) != offset:
+            return None
+    return offset if _utc_offset(last) == offset else None
+
+
+def _window_offset(items: List[Dict[str, Any]]) -> Optional[int]:
+    """_range_offset for a time-ordered list of items with a 'dt' field."""
+    if not items:
+        return 0
+    return _range_offset(items[0]['dt'], items[-1]['dt'])
+
+
+def _collect_top_level_keys(events, keys: set):
+    """Passes ijson parse events through, adding each top-level object key to keys."""
+    for prefix, event, value in events:
+        if event == 'map_key' and prefix == '':
+            keys.add(value)
+        yield prefix, event, value
+
+
+def _interval_start(local_ts: int, interval_secs: int) -> int:
+    """Start of the interval containing local_ts; intervals restart at each local midnight."""
+    day_start = local_ts - local_ts % 86400
+    return day_start + (local_ts - day_start) // interval_secs * interval_secs
+
+
+class _RunningStats:
+    """Count, sum, min and max of a series, updated one value at a time."""
+    __slots__ = ('count', 'total', 'min', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def mean(self) -> float:
+        return self.total / self.count
+
+
+class _IntervalAgg:
+    """Running statistics and weather conditions collected for one interval."""
+    __slots__ = ('temperatures', 'feels_like', 'humidity', 'pressure', 'wind_speed', 'weather_items')
+
+    def __init__(self):
+        self.temperatures = _RunningStats()
+        self.feels_like = _RunningStats()
+        self.humidity = _RunningStats()
+        self.pressure = _RunningStats()
+        self.wind_speed = _RunningStats()
+        self.weather_items = []
+
+
 class OpenWeatherAPI:
     BASE_URL = "https://api.openweathermap.org/data/2.5"
     GEOCODE_URL = "http://api.openweathermap.org/geo/1.0/direct"
     AIR_POLLUTION_URL = "http://api.openweathermap.org/data/2.5/air_pollution"
-    API_KEY = "3debd8fec55dfc7d852be72d1381fd8f"  # Replace with your OpenWeather API key
 
     @staticmethod
     def get_coordinates(city_name: str, state_code: Optional[str] = None, country_code: Optional[str] = None) -> Optional[Tuple[float, float]]:
         """Converts a city name to latitude and longitude using OpenWeather's Geocoding API."""
+        cache_key = (city_name.strip().lower(), (state_code or "").upper(), (country_code or "").upper())
+        coords = _cache_get('geocode', cache_key)
+        if coords is not None:
+            return coords
+
         params = {
             'q': f"{city_name},{state_code},{country_code}" if state_code and country_code else city_name,
-            'limit': 1,
-            'appid': OpenWeatherAPI.API_KEY
+            'limit': 1
         }
-        response = requests.get(OpenWeatherAPI.GEOCODE_URL, params=params)
-        if response.status_code == 200 and response.json():
-            location = response.json()[0]
-            return location['lat'], location['lon']
+        response = _session.get(OpenWeatherAPI.GEOCODE_URL, params=params, timeout=REQUEST_TIMEOUT)
+        if response.ok:
+            locations = _json_loads(response.content)
+            if locations:
+                location = locations[0]
+                coords = location['lat'], location['lon']
+                _cache_set('geocode', cache_key, coords)
+                return coords
         return None
 
     @staticmethod
     def fetch_weather_data(endpoint: str, params: dict) -> Optional[dict]:
-        """Fetches weather data from OpenWeather API for a given endpoint and parameters."""
-        params['appid'] = OpenWeatherAPI.API_KEY
-        response = requests.get(f"{OpenWeatherAPI.BASE_URL}/{endpoint}", params=params)
-        if response.status_code == 200:
-            return response.json()
+        """Fetches weather data from OpenWeather API for a given endpoint and parameters.
+
+        Responses of the endpoints listed in CACHE_TTLS are cached; treat the
+        returned dict as read-only. The public methods built on it return
+        copies.
+        """
+        cacheable = endpoint in CACHE_TTLS
+        if not cacheable:
+            return OpenWeatherAPI._request_weather_data(endpoint, params)
+
+        cache_key = tuple(sorted(params.items()))
+        while True:
+            data = _cache_get(endpoint, cache_key)
+            if data is not None:
+                return data
+            with _cache_lock:
+                pending = _in_flight.get((endpoint, cache_key))
+                if pending is None:
+                    done = _in_flight[(endpoint, cache_key)] = threading.Event()
+            if pending is None:
+                break
+            pending.wait()
+            # Served from the cache on the next pass; a failed request isn't
+            # cached, and this caller then makes its own
+
+        try:
+            data = OpenWeatherAPI._request_weather_data(endpoint, params)
+            _cache_set(endpoint, cache_key, data)
+            return data
+        finally:
+            with _cache_lock:
+                del _in_flight[(endpoint, cache_key)]
+            done.set()
+
+    @staticmethod
+    def _request_weather_data(endpoint: str, params: dict) -> Optional[dict]:
+        """Requests one endpoint, bypassing the cache; None if the request failed."""
+        response = _session.get(f"{OpenWeatherAPI.BASE_URL}/{endpoint}", params=params, timeout=REQUEST_TIMEOUT)
+        if response.ok:
+            return _json_loads(response.content)
         return None
 
     @staticmethod
@@ -117,40 +371,50 @@ class OpenWeatherAPI:
         if not coords:
             return None
         lat, lon = coords
+        return OpenWeatherAPI._current_weather_from_coords(lat, lon)
+
+    @staticmethod
+    def _current_weather_from_coords(lat: float, lon: float) -> Optional[Dict[str, Any]]:
+        """get_current_weather for an already geocoded location."""
         params = {'lat': lat, 'lon': lon, 'units': 'metric'}
 
         data = OpenWeatherAPI.fetch_weather_data('weather', params)
         if data and 'weather' in data and len(data['weather']) > 0:
+            # Deep copy, so neither the added description nor callers' edits
+            # reach the cached response
+            data = copy.deepcopy(data)
             # Add the weather description from our map
             weather_id = data['weather'][0]['id']
-            data['weather_description'] = WEATHER_CODE_MAP.get(weather_id, data['weather'][0]['description'])
+            data['weather_description'] = _weather_desc(weather_id, data['weather'][0]['description'])
         
         return data
 
     @staticmethod
     def get_mode_weather(weather_list: List[Dict]) -> Dict:
         """Gets the most common weather condition from a list of weather data"""
-        if not weather_list:
-            return {}
-            
-        weather_ids = [item['id'] for item in weather_list]
-        if not weather_ids:
-            return {}
-            
-        most_common_id = Counter(weather_ids).most_common(1)[0][0]
-        
-        # Find the first weather item with this ID
+        # Count ids and keep the first item seen for each in one pass; max()
+        # returns the first id on ties, same as Counter.most_common(1)
+        counts = {}
+        first_items = {}
         for item in weather_list:
-            if item['id'] == most_common_id:
-                return {
-                    'id': item['id'],
-                    'main': item['main'],
-                    'description': item['description'],
-                    'icon': item['icon'],
-                    'readable_description': WEATHER_CODE_MAP.get(item['id'], item['description'])
-                }
-                
-        return {}
+            weather_id = item['id']
+            if weather_id in counts:
+                counts[weather_id] += 1
+            else:
+                counts[weather_id] = 1
+                first_items[weather_id] = item
+
+        if not counts:
+            return {}
+
+        item = first_items[max(counts, key=counts.get)]
+        return {
+            'id': item['id'],
+            'main': item['main'],
+            'description': item['description'],
+            'icon': item['icon'],
+            'readable_description': _weather_desc(item['id'], item['description'])
+        }
 
     @staticmethod
     def get_hourly_forecast_condensed(city_name: str, state_code: Optional[str] = None, country_code: Optional[str] = None,
@@ -170,76 +434,74 @@ class OpenWeatherAPI:
         if not coords:
             return None
         lat, lon = coords
+        return OpenWeatherAPI._hourly_forecast_from_coords(lat, lon, interval_hours)
+
+    @staticmethod
+    def _hourly_forecast_from_coords(lat: float, lon: float, interval_hours: int = 6) -> Optional[Dict[str, Any]]:
+        """get_hourly_forecast_condensed for an already geocoded location."""
         params = {'lat': lat, 'lon': lon, 'units': 'metric'}
         data = OpenWeatherAPI.fetch_weather_data('forecast', params)
         
         if not data or 'list' not in data:
             return None
             
-        # Group forecast data by intervals
-        intervals = {}
-        city_info = data.get('city', {})
+        # Group forecast data by intervals, keyed by the interval's start in
+        # local-time epoch seconds; datetimes are only built once per interval
+        intervals = defaultdict(_IntervalAgg)
+        # Copied, as the response may be shared with the cache
+        city_info = copy.deepcopy(data.get('city', {}))
+        offset = _window_offset(data['list'])
+        interval_secs = interval_hours * 3600
         
         for forecast_item in data['list']:
-            dt = datetime.fromtimestamp(forecast_item['dt'])
-            
-            # Create interval key (e.g., "2025-04-29 00:00" for a 6-hour interval starting at midnight)
-            interval_start = dt.replace(hour=(dt.hour // interval_hours) * interval_hours, minute=0, second=0)
-            interval_key = interval_start.strftime("%Y-%m-%d %H:%M")
+            dt = forecast_item['dt']
+            local_ts = dt + (offset if offset is not None else _utc_offset(dt))
+            interval_key = _interval_start(local_ts, interval_secs)
             
-            if interval_key not in intervals:
-                intervals[interval_key] = {
-                    'start_time': interval_start.isoformat(),
-                    'end_time': (interval_start + timedelta(hours=interval_hours)).isoformat(),
-                    'temperatures': [],
-                    'feels_like': [],
-                    'humidity': [],
-                    'pressure': [],
-                    'wind_speed': [],
-                    'weather_items': []
-                }
+            bucket = intervals[interval_key]
             
             # Collect data for statistics
-            intervals[interval_key]['temperatures'].append(forecast_item['main']['temp'])
-            intervals[interval_key]['feels_like'].append(forecast_item['main']['feels_like'])
-            intervals[interval_key]['humidity'].append(forecast_item['main']['humidity'])
-            intervals[interval_key]['pressure'].append(forecast_item['main']['pressure'])
+            main = forecast_item['main']
+            bucket.temperatures.add(main['temp'])
+            bucket.feels_like.add(main['feels_like'])
+            bucket.humidity.add(main['humidity'])
+            bucket.pressure.add(main['pressure'])
             if 'wind' in forecast_item and 'speed' in forecast_item['wind']:
-                intervals[interval_key]['wind_speed'].append(forecast_item['wind']['speed'])
+                bucket.wind_speed.add(forecast_item['wind']['speed'])
             
             # Collect weather conditions
             if 'weather' in forecast_item and forecast_item['weather']:
-                intervals[interval_key]['weather_items'].extend(forecast_item['weather'])
+                bucket.weather_items.extend(forecast_item['weather'])
         
-        # Calculate statistics for each interval
+        # Calculate statistics for each interval, in start time order
         summarized_intervals = []
-        for interval_key, data in intervals.items():
+        for interval_key in sorted(intervals):
+            data = intervals[interval_key]
+            interval_start = _EPOCH + timedelta(seconds=interval_key)
             # Find most common weather condition
-            weather_summary = OpenWeatherAPI.get_mode_weather(data['weather_items'])
+            weather_summary = OpenWeatherAPI.get_mode_weather(data.weather_items)
             
             interval_summary = {
-                'interval': interval_key,
-                'start_time': data['start_time'],
-                'end_time': data['end_time'],
+                # e.g. "2025-04-29 00:00" for a 6-hour interval starting at midnight
+                'interval': interval_start.strftime("%Y-%m-%d %H:%M"),
+                'start_time': interval_start.isoformat(),
+                'end_time': (interval_start + timedelta(hours=interval_hours)).isoformat(),
                 'temperature': {
-                    'avg': round(statistics.mean(data['temperatures']), 1),
-                    'min': round(min(data['temperatures']), 1),
-                    'max': round(max(data['temperatures']), 1)
+                    'avg': round(data.temperatures.mean(), 1),
+                    'min': round(data.temperatures.min, 1),
+                    'max': round(data.temperatures.max, 1)
                 },
-                'feels_like': round(statistics.mean(data['feels_like']), 1),
-                'humidity': round(statistics.mean(data['humidity'])),
-                'pressure': round(statistics.mean(data['pressure'])),
+                'feels_like': round(data.feels_like.mean(), 1),
+                'humidity': round(data.humidity.mean()),
+                'pressure': round(data.pressure.mean()),
                 'weather': weather_summary
             }
             
-            if data['wind_speed']:
-                interval_summary['wind_speed'] = round(statistics.mean(data['wind_speed']), 1)
+            if data.wind_speed:
+                interval_summary['wind_speed'] = round(data.wind_speed.mean(), 1)
                 
             summarized_intervals.append(interval_summary)
         
-        # Sort intervals by start time
-        summarized_intervals.sort(key=lambda x: x['start_time'])
-        
         return {
             'city': city_info,
             'intervals': summarized_intervals,
@@ -263,15 +525,21 @@ class OpenWeatherAPI:
         if not coords:
             return None
         lat, lon = coords
+        return OpenWeatherAPI._daily_forecast_from_coords(lat, lon, cnt)
+
+    @staticmethod
+    def _daily_forecast_from_coords(lat: float, lon: float, cnt: int = 7) -> Optional[Dict[str, Any]]:
+        """get_daily_forecast_condensed for an already geocoded location."""
         params = {'lat': lat, 'lon': lon, 'cnt': cnt, 'units': 'metric'}
         data = OpenWeatherAPI.fetch_weather_data('forecast/daily', params)
         
         if not data or 'list' not in data:
             # Try using hourly forecast API to create daily aggregates if daily API fails
-            return OpenWeatherAPI._create_daily_forecast_from_hourly(city_name, state_code, country_code, cnt)
+            return OpenWeatherAPI._daily_forecast_from_hourly_coords(lat, lon, cnt)
             
         daily_forecast = []
-        city_info = data.get('city', {})
+        # Copied, as the response may be shared with the cache
+        city_info = copy.deepcopy(data.get('city', {}))
         
         for forecast_item in data['list']:
             dt = datetime.fromtimestamp(forecast_item['dt'])
@@ -286,23 +554,33 @@ class OpenWeatherAPI:
                     'main': forecast_item['weather'][0]['main'],
                     'description': forecast_item['weather'][0]['description'],
                     'icon': forecast_item['weather'][0]['icon'],
-                    'readable_description': WEATHER_CODE_MAP.get(weather_id, forecast_item['weather'][0]['description'])
+                    'readable_description': _weather_desc(weather_id, forecast_item['weather'][0]['description'])
+                }
+            
+            # Daily temperatures are dicts of day parts; check each once per row
+            temp = forecast_item.get('temp')
+            if isinstance(temp, dict):
+                temperature = {
+                    'day': round(temp['day'], 1),
+                    'min': round(temp['min'], 1),
+                    'max': round(temp['max'], 1),
+                    'night': round(temp['night'], 1),
                 }
+            else:
+                temperature = {'day': None, 'min': None, 'max': None, 'night': None}
+            
+            feels_like = forecast_item.get('feels_like')
+            if isinstance(feels_like, dict):
+                feels_like = {'day': round(feels_like['day'], 1), 'night': round(feels_like['night'], 1)}
+            else:
+                feels_like = {'day': None, 'night': None}
             
             # Create daily summary
             day_summary = {
                 'date': date_str,
                 'day_of_week': dt.strftime("%A"),
-                'temperature': {
-                    'day': round(forecast_item['temp']['day'], 1) if isinstance(forecast_item.get('temp'), dict) else None,
-                    'min': round(forecast_item['temp']['min'], 1) if isinstance(forecast_item.get('temp'), dict) else None,
-                    'max': round(forecast_item['temp']['max'], 1) if isinstance(forecast_item.get('temp'), dict) else None,
-                    'night': round(forecast_item['temp']['night'], 1) if isinstance(forecast_item.get('temp'), dict) else None,
-                },
-                'feels_like': {
-                    'day': round(forecast_item['feels_like']['day'], 1) if isinstance(forecast_item.get('feels_like'), dict) else None,
-                    'night': round(forecast_item['feels_like']['night'], 1) if isinstance(forecast_item.get('feels_like'), dict) else None
-                },
+                'temperature': temperature,
+                'feels_like': feels_like,
                 'humidity': forecast_item.get('humidity'),
                 'pressure': forecast_item.get('pressure'),
                 'weather': weather_summary
@@ -325,66 +603,64 @@ class OpenWeatherAPI:
         if not coords:
             return None
         lat, lon = coords
+        return OpenWeatherAPI._daily_forecast_from_hourly_coords(lat, lon, cnt)
+
+    @staticmethod
+    def _daily_forecast_from_hourly_coords(lat: float, lon: float, cnt: int = 7) -> Optional[Dict[str, Any]]:
+        """_create_daily_forecast_from_hourly for an already geocoded location."""
         params = {'lat': lat, 'lon': lon, 'units': 'metric'}
         data = OpenWeatherAPI.fetch_weather_data('forecast', params)
         
         if not data or 'list' not in data:
             return None
             
-        # Group forecast data by day
-        days = {}
-        city_info = data.get('city', {})
+        # Group forecast data by local day, keyed by days since _EPOCH
+        days = defaultdict(_IntervalAgg)
+        # Copied, as the response may be shared with the cache
+        city_info = copy.deepcopy(data.get('city', {}))
+        offset = _window_offset(data['list'])
         
         for forecast_item in data['list']:
-            dt = datetime.fromtimestamp(forecast_item['dt'])
-            day_key = dt.strftime("%Y-%m-%d")
-            
-            if day_key not in days:
-                days[day_key] = {
-                    'date': day_key,
-                    'day_of_week': dt.strftime("%A"),
-                    'temperatures': [],
-                    'feels_like': [],
-                    'humidity': [],
-                    'pressure': [],
-                    'wind_speed': [],
-                    'weather_items': []
-                }
+            dt = forecast_item['dt']
+            local_ts = dt + (offset if offset is not None else _utc_offset(dt))
+            day = days[local_ts // 86400]
             
             # Collect data for statistics
-            days[day_key]['temperatures'].append(forecast_item['main']['temp'])
-            days[day_key]['feels_like'].append(forecast_item['main']['feels_like'])
-            days[day_key]['humidity'].append(forecast_item['main']['humidity'])
-            days[day_key]['pressure'].append(forecast_item['main']['pressure'])
+            main = forecast_item['main']
+            day.temperatures.add(main['temp'])
+            day.feels_like.add(main['feels_like'])
+            day.humidity.add(main['humidity'])
+            day.pressure.add(main['pressure'])
             if 'wind' in forecast_item and 'speed' in forecast_item['wind']:
-                days[day_key]['wind_speed'].append(forecast_item['wind']['speed'])
+                day.wind_speed.add(forecast_item['wind']['speed'])
             
             # Collect weather conditions
             if 'weather' in forecast_item and forecast_item['weather']:
-                days[day_key]['weather_items'].extend(forecast_item['weather'])
+                day.weather_items.extend(forecast_item['weather'])
         
         # Calculate statistics for each day
         daily_forecast = []
-        for _, day_data in sorted(days.items())[:cnt]:  # Limit to requested number of days
+        # Earliest cnt days, without sorting the days that get dropped
+        for day_key, day_data in nsmallest(cnt, days.items(), key=lambda kv: kv[0]):
             # Find most common weather condition
-            weather_summary = OpenWeatherAPI.get_mode_weather(day_data['weather_items'])
+            weather_summary = OpenWeatherAPI.get_mode_weather(day_data.weather_items)
             
             day_summary = {
-                'date': day_data['date'],
-                'day_of_week': day_data['day_of_week'],
+                'date': (_EPOCH + timedelta(days=day_key)).strftime("%Y-%m-%d"),
+                'day_of_week': _WEEKDAYS[(day_key + 3) % 7],
                 'temperature': {
-                    'avg': round(statistics.mean(day_data['temperatures']), 1),
-                    'min': round(min(day_data['temperatures']), 1),
-                    'max': round(max(day_data['temperatures']), 1)
+                    'avg': round(day_data.temperatures.mean(), 1),
+                    'min': round(day_data.temperatures.min, 1),
+                    'max': round(day_data.temperatures.max, 1)
                 },
-                'feels_like': round(statistics.mean(day_data['feels_like']), 1),
-                'humidity': round(statistics.mean(day_data['humidity'])),
-                'pressure': round(statistics.mean(day_data['pressure'])),
+                'feels_like': round(day_data.feels_like.mean(), 1),
+                'humidity': round(day_data.humidity.mean()),
+                'pressure': round(day_data.pressure.mean()),
                 'weather': weather_summary
             }
             
-            if day_data['wind_speed']:
-                day_summary['wind_speed'] = round(statistics.mean(day_data['wind_speed']), 1)
+            if day_data.wind_speed:
+                day_summary['wind_speed'] = round(day_data.wind_speed.mean(), 1)
                 
             daily_forecast.append(day_summary)
         
@@ -414,9 +690,14 @@ class OpenWeatherAPI:
         if not coords:
             return None
         lat, lon = coords
-        
-        start_timestamp = int(datetime.strptime(start_date, "%Y-%m-%d").timestamp())
-        end_timestamp = int(datetime.strptime(end_date, "%Y-%m-%d").timestamp())
+        return OpenWeatherAPI._historical_weather_from_coords(lat, lon, city_name, start_date, end_date, interval_hours)
+
+    @staticmethod
+    def _historical_weather_from_coords(lat: float, lon: float, city_name: str, start_date: str, end_date: str,
+                                        interval_hours: int = 24) -> Optional[Dict[str, Any]]:
+        """get_historical_weather_condensed for an already geocoded location."""
+        start_timestamp = int(datetime.fromisoformat(start_date).timestamp())
+        end_timestamp = int(datetime.fromisoformat(end_date).timestamp())
         
         params = {
             'lat': lat,
@@ -424,89 +705,96 @@ class OpenWeatherAPI:
             'type': 'hour',
             'start': start_timestamp,
             'end': end_timestamp,
-            'appid': OpenWeatherAPI.API_KEY,
             'units': 'metric'
         }
         
-        response = requests.get("http://history.openweathermap.org/data/2.5/history/city", params=params)
-        if response.status_code != 200:
-            return None
+        # Long ranges are folded into the intervals while the body is still
+        # being read, so the full hourly list is never held in memory
+        stream = _ijson is not None and end_timestamp - start_timestamp > STREAM_MIN_RANGE
+        with _session.get("http://history.openweathermap.org/data/2.5/history/city", params=params,
+                          timeout=REQUEST_TIMEOUT, stream=stream) as response:
+            if not response.ok:
+                return None
             
-        data = response.json()
-        if 'list' not in data:
-            return None
-        
-        # Group data by intervals
-        intervals = {}
-        city_info = data.get('city', {})
-        
-        for item in data['list']:
-            dt = datetime.fromtimestamp(item['dt'])
+            if stream:
+                response.raw.decode_content = True
+                # Whether the body has a 'list' at all (error and quota replies
+                # don't) is only known once it has been read; see below
+                top_level_keys = set()
+                events = _collect_top_level_keys(_ijson.parse(response.raw, use_float=True), top_level_keys)
+                items = _ijson.items(events, 'list.item')
+                offset = _range_offset(start_timestamp, end_timestamp)
+            else:
+                data = _json_loads(response.content)
+                if 'list' not in data:
+                    return None
+                items = data['list']
+                offset = _window_offset(items)
             
-            if interval_hours == 24:  # Daily intervals
-                interval_key = dt.strftime("%Y-%m-%d")
-                interval_start = dt.replace(hour=0, minute=0, second=0)
-            else:  # Custom hour intervals
-                interval_start = dt.replace(hour=(dt.hour // interval_hours) * interval_hours, minute=0, second=0)
-                interval_key = interval_start.strftime("%Y-%m-%d %H:%M")
+            # Group data by intervals, keyed by the interval's start in local-time
+            # epoch seconds; datetimes are only built once per interval
+            intervals = defaultdict(_IntervalAgg)
+            interval_secs = interval_hours * 3600
             
-            if interval_key not in intervals:
-                intervals[interval_key] = {
-                    'start_time': interval_start.isoformat(),
-                    'end_time': (interval_start + timedelta(hours=interval_hours)).isoformat(),
-                    'temperatures': [],
-                    'humidity': [],
-                    'pressure': [],
-                    'wind_speed': [],
-                    'weather_items': []
-                }
-            
-            # Collect data for statistics
-            if 'main' in item:
-                if 'temp' in item['main']:
-                    intervals[interval_key]['temperatures'].append(item['main']['temp'])
-                if 'humidity' in item['main']:
-                    intervals[interval_key]['humidity'].append(item['main']['humidity'])
-                if 'pressure' in item['main']:
-                    intervals[interval_key]['pressure'].append(item['main']['pressure'])
-            
-            if 'wind' in item and 'speed' in item['wind']:
-                intervals[interval_key]['wind_speed'].append(item['wind']['speed'])
+            for item in items:
+                dt = item['dt']
+                local_ts = dt + (offset if offset is not None else _utc_offset(dt))
+                interval_key = _interval_start(local_ts, interval_secs)
+                
+                bucket = intervals[interval_key]
+                
+                # Collect data for statistics
+                if 'main' in item:
+                    main = item['main']
+                    if 'temp' in main:
+                        bucket.temperatures.add(main['temp'])
+                    if 'humidity' in main:
+                        bucket.humidity.add(main['humidity'])
+                    if 'pressure' in main:
+                        bucket.pressure.add(main['pressure'])
+                
+                if 'wind' in item and 'speed' in item['wind']:
+                    bucket.wind_speed.add(item['wind']['speed'])
+                
+                # Collect weather conditions
+                if 'weather' in item and item['weather']:
+                    bucket.weather_items.extend(item['weather'])
             
-            # Collect weather conditions
-            if 'weather' in item and item['weather']:
-                intervals[interval_key]['weather_items'].extend(item['weather'])
+            if stream and 'list' not in top_level_keys:
+                return None
         
         # Calculate statistics for each interval
         summarized_intervals = []
-        for interval_key, interval_data in sorted(intervals.items()):
+        for interval_key in sorted(intervals):
+            interval_data = intervals[interval_key]
+            interval_start = _EPOCH + timedelta(seconds=interval_key)
             # Find most common weather condition
-            weather_summary = OpenWeatherAPI.get_mode_weather(interval_data['weather_items'])
+            weather_summary = OpenWeatherAPI.get_mode_weather(interval_data.weather_items)
             
             interval_summary = {
-                'interval': interval_key,
-                'start_time': interval_data['start_time'],
-                'end_time': interval_data['end_time'],
+                'interval': interval_start.strftime("%Y-%m-%d" if interval_hours == 24 else "%Y-%m-%d %H:%M"),
+                'start_time': interval_start.isoformat(),
+                'end_time': (interval_start + timedelta(hours=interval_hours)).isoformat(),
                 'weather': weather_summary
             }
             
             # Add temperature statistics if available
-            if interval_data['temperatures']:
+            if interval_data.temperatures:
                 interval_summary['temperature'] = {
-                    'avg': round(statistics.mean(interval_data['temperatures']), 1),
-                    'min': round(min(interval_data['temperatures']), 1),
-                    'max': round(max(interval_data['temperatures']), 1)
+                    'avg': round(interval_data.temperatures.mean(), 1),
+                    'min': round(interval_data.temperatures.min, 1),
+                    'max': round(interval_data.temperatures.max, 1)
                 }
             
             # Add other statistics if available
-            if interval_data['humidity']:
-                interval_summary['humidity'] = round(statistics.mean(interval_data['humidity']))
+            if interval_data.humidity:
+                interval_summary['humidity'] = round(interval_data.humidity.mean())
             
-            if interval_data['pressure']:
-                interval_summary['pressure'] = round(statistics.mean(interval_data['pressure']))
+            if interval_data.pressure:
+                interval_summary['pressure'] = round(interval_data.pressure.mean())
             
-            if interval_data['wind_speed']:
-                interval_summary['wind_speed'] = round(statistics.mean(interval_data['wind_speed']), 1)
+            if interval_data.wind_speed:
+                interval_summary['wind_speed'] = round(interval_data.wind_speed.mean(), 1)
                 
             summarized_intervals.append(interval_summary)
         
@@ -531,33 +819,31 @@ class OpenWeatherAPI:
         if not coords:
             return None
         lat, lon = coords
-        
-        params = {
-            'lat': lat,
-            'lon': lon,
-            'appid': OpenWeatherAPI.API_KEY
-        }
-        
-        response = requests.get(OpenWeatherAPI.AIR_POLLUTION_URL, params=params)
-        if response.status_code != 200:
-            return None
-            
-        data = response.json()
+        return OpenWeatherAPI._air_pollution_from_coords(lat, lon, city_name)
+
+    @staticmethod
+    def _air_pollution_from_coords(lat: float, lon: float, city_name: str) -> Optional[Dict[str, Any]]:
+        """get_air_pollution_condensed for an already geocoded location."""
+        data = _cache_get('air_pollution', (lat, lon))
+        if data is None:
+            params = {
+                'lat': lat,
+                'lon': lon
+            }
+
+            response = _session.get(OpenWeatherAPI.AIR_POLLUTION_URL, params=params, timeout=REQUEST_TIMEOUT)
+            if not response.ok:
+                return None
+
+            data = _json_loads(response.content)
+            _cache_set('air_pollution', (lat, lon), data)
+
         if 'list' not in data or not data['list']:
             return None
         
         # Get the most recent air pollution data
         pollution_info = data['list'][0]
         
-        # AQI description mapper
-        aqi_descriptions = {
-            1: "Good",
-            2: "Fair",
-            3: "Moderate",
-            4: "Poor",
-            5: "Very Poor"
-        }
-        
         # Create condensed output
         result = {
             'location': {
@@ -566,30 +852,59 @@ class OpenWeatherAPI:
             },
             'timestamp': datetime.fromtimestamp(pollution_info['dt']).isoformat(),
             'air_quality_index': pollution_info['main']['aqi'],
-            'air_quality_level': aqi_descriptions.get(pollution_info['main']['aqi'], "Unknown"),
-            'components': {}
+            'air_quality_level': AQI_DESCRIPTIONS.get(pollution_info['main']['aqi'], "Unknown")
         }
         
         # Add components with descriptions
-        component_descriptions = {
-            'co': 'Carbon monoxide',
-            'no': 'Nitrogen monoxide',
-            'no2': 'Nitrogen dioxide',
-            'o3': 'Ozone',
-            'so2': 'Sulphur dioxide',
-            'pm2_5': 'Fine particles (PM2.5)',
-            'pm10': 'Coarse particles (PM10)',
-            'nh3': 'Ammonia'
+        result['components'] = {
+            component: {'value': value, 'name': COMPONENT_DESCRIPTIONS.get(component, component)}
+            for component, value in pollution_info['components'].items()
         }
         
-        for component, value in pollution_info['components'].items():
-            result['components'][component] = {
-                'value': value,
-                'name': component_descriptions.get(component, component)
-            }
-        
         return result
 
+    @staticmethod
+    def get_weather_bundle(city_name: str, state_code: Optional[str] = None, country_code: Optional[str] = None,
+                           interval_hours: int = 6, cnt: int = 7, start_date: Optional[str] = None,
+                           end_date: Optional[str] = None, history_interval_hours: int = 24) -> Optional[Dict[str, Any]]:
+        """Gets current weather, condensed forecasts and air pollution for a location in one call.
+        
+        The location is geocoded once and the lookups then run concurrently.
+        
+        Args:
+            city_name: Name of the city
+            state_code: State code (optional)
+            country_code: Country code (optional)
+            interval_hours: Hours to group the hourly forecast by (default: 6)
+            cnt: Number of days for the daily forecast (default: 7)
+            start_date: Start date in YYYY-MM-DD format; with end_date, adds condensed historical weather (optional)
+            end_date: End date in YYYY-MM-DD format (optional)
+            history_interval_hours: Hours to group historical data by (default: 24 for daily)
+            
+        Returns:
+            JSON with 'current', 'hourly', 'daily' and 'air_pollution' entries, plus 'historical'
+            if a date range was given, or None if location not found
+        """
+        # Resolve once up front and hand the coordinates to each lookup
+        coords = OpenWeatherAPI.get_coordinates(city_name, state_code, country_code)
+        if not coords:
+            return None
+
+        lookups = {
+            'current': (OpenWeatherAPI._current_weather_from_coords, ()),
+            'hourly': (OpenWeatherAPI._hourly_forecast_from_coords, (interval_hours,)),
+            'daily': (OpenWeatherAPI._daily_forecast_from_coords, (cnt,)),
+            'air_pollution': (OpenWeatherAPI._air_pollution_from_coords, (city_name,)),
+        }
+        if start_date and end_date:
+            lookups['historical'] = (OpenWeatherAPI._historical_weather_from_coords,
+                                     (city_name, start_date, end_date, history_interval_hours))
+        with ThreadPoolExecutor(max_workers=len(lookups)) as executor:
+            futures = {executor.submit(func, *coords, *args): name for name, (func, args) in lookups.items()}
+            results = {futures[future]: future.result() for future in as_completed(futures)}
+
+        return {name: results[name] for name in lookups}
+
     @staticmethod
     def get_tile_coordinates(lat: float, lng: float, zoom: int) -> Tuple[int, int]:
         """
@@ -625,6 +940,61 @@ class OpenWeatherAPI:
 
         return tile_coordinate_x, tile_coordinate_y
 
+    @staticmethod
+    def get_tile_coordinates_batch(lats, lngs, zoom: int):
+        """
+        Vectorized get_tile_coordinates for many locations at once, e.g. when
+        building a grid of map tiles.
+
+        Args:
+            lats: Sequence or array of latitudes.
+            lngs: Sequence or array of longitudes, same length as lats.
+            zoom: The zoom level.
+
+        Returns:
+            A tuple of two int32 arrays with the tile x and y coordinates
+        """
+        # numpy is only needed here; keep it out of the module import
+        import numpy as np
+
+        TILE_SIZE = 256
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+
+        # Same projection as get_tile_coordinates, element-wise
+        siny = np.clip(np.sin(lats * np.pi / 180), -0.9999, 0.9999)
+        world_coordinate_x = TILE_SIZE * (0.5 + lngs / 360)
+        world_coordinate_y = TILE_SIZE * (0.5 - np.log((1 + siny) / (1 - siny)) / (4 * np.pi))
+
+        scale = 1 << zoom
+        tile_coordinate_x = np.floor(np.floor(world_coordinate_x * scale) / TILE_SIZE).astype(np.int32)
+        tile_coordinate_y = np.floor(np.floor(world_coordinate_y * scale) / TILE_SIZE).astype(np.int32)
+
+        return tile_coordinate_x, tile_coordinate_y
+
+    @staticmethod
+    def _build_tile_url(layer: str, zoom: int, x: int, y: int, date: int = None, opacity: float = 0.8,
+                        palette: str = None, fill_bound: bool = False, arrow_step: int = None,
+                        use_norm: bool = False) -> Tuple[str, Dict[str, Any]]:
+        """Base URL and query parameters (without appid) for one Maps 2.0 tile."""
+        base_url = f"http://maps.openweathermap.org/maps/2.0/weather/{layer}/{zoom}/{x}/{y}"
+        
+        params = {
+            "opacity": opacity,
+            "fill_bound": str(fill_bound).lower()
+        }
+
+        if date is not None:
+            params["date"] = date
+        if palette is not None:
+            params["palette"] = palette
+        if layer == "WND":
+            if arrow_step is not None:
+                params["arrow_step"] = arrow_step
+            params["use_norm"] = str(use_norm).lower()
+
+        return base_url, params
+
     @staticmethod
     def get_weather_map_url(
         lat: float,
@@ -659,25 +1029,14 @@ class OpenWeatherAPI:
         # Get tile coordinates from lat/lng
         x, y = OpenWeatherAPI.get_tile_coordinates(lat=lat, lng=lng, zoom=zoom)
         
-        base_url = f"http://maps.openweathermap.org/maps/2.0/weather/{layer}/{zoom}/{x}/{y}"
-        
-        params = {
-            "appid": OpenWeatherAPI.API_KEY,
-            "opacity": opacity,
-            "fill_bound": str(fill_bound).lower()
-        }
+        base_url, params = OpenWeatherAPI._build_tile_url(layer, zoom, x, y, date, opacity, palette,
+                                                          fill_bound, arrow_step, use_norm)
+        # The URL is handed out rather than fetched through the session, so it
+        # carries the key itself
+        params = {"appid": _api_key(), **params}
 
-        if date is not None:
-            params["date"] = date
-        if palette is not None:
-            params["palette"] = palette
-        if layer == "WND":
-            if arrow_step is not None:
-                params["arrow_step"] = arrow_step
-            params["use_norm"] = str(use_norm).lower()
-
-        query = "&".join(f"{key}={value}" for key, value in params.items())
-        full_url = f"{base_url}?{query}"
+        # urlencode escapes values such as palettes containing ';' or '#'
+        full_url = f"{base_url}?{urlencode(params)}"
         
         # Return map info as a JSON object
         return {
@@ -693,29 +1052,72 @@ class OpenWeatherAPI:
             "parameters": params
         }
 
+    @staticmethod
+    def get_weather_tiles_batch(tiles: List[Tuple[int, int]], layer: str = "TA2", zoom: int = 4,
+                                max_workers: int = 8, **options) -> Dict[Tuple[int, int], Optional[bytes]]:
+        """
+        Fetches a set of map tiles concurrently, e.g. a grid for a map viewer.
+
+        Args:
+            tiles: (x, y) tile coordinates, e.g. from get_tile_coordinates_batch
+            layer: Weather map layer (e.g., 'TA2', 'PA0', 'WND', etc.)
+            zoom: Zoom level
+            max_workers: Number of tiles downloaded at once (default: 8)
+            **options: date, opacity, palette, fill_bound, arrow_step and
+                use_norm, as for get_weather_map_url
+
+        Returns:
+            Dict mapping each (x, y) to the PNG bytes, or None if that tile failed
+        """
+        def fetch(x: int, y: int) -> Optional[bytes]:
+            base_url, params = OpenWeatherAPI._build_tile_url(layer, zoom, x, y, **options)
+            response = _session.get(base_url, params=params, timeout=REQUEST_TIMEOUT)
+            return response.content if response.ok else None
+
+        # Tile downloads are I/O bound, so threads overlap them on the pooled session
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(fetch, x, y): (x, y) for x, y in tiles}
+            return {futures[future]: future.result() for future in as_completed(futures)}
+
+    @staticmethod
+    def save_weather_map(url: str, path: str = "weather_map.png") -> bool:
+        """
+        Downloads a map tile, e.g. the 'url' returned by get_weather_map_url, to a file.
+
+        The PNG is streamed to disk as sent, without buffering the whole body
+        or decoding it with PIL.
+
+        Args:
+            url: Tile URL including its query string
+            path: File to write the image to (default: weather_map.png)
+
+        Returns:
+            True if the tile was saved, False if the request failed
+        """
+        with _session.get(url, stream=True, timeout=REQUEST_TIMEOUT) as response:
+            if not response.ok:
+                return False
+            response.raw.decode_content = True
+            with open(path, "wb") as f:
+                shutil.copyfileobj(response.raw, f)
+        return True
+
 # Example usage:
 if __name__ == "__main__":
-    # Get current weather
-    weather = OpenWeatherAPI.get_current_weather("Nagpur", "MH", "IN")
-    print("Current weather:", weather)
-    
-    # Get condensed hourly forecast
-    forecast = OpenWeatherAPI.get_hourly_forecast_condensed("Nagpur", "MH", "IN", interval_hours=6)
-    print("Condensed hourly forecast:", forecast)
-    
-    # Get condensed daily forecast
-    daily_forecast = OpenWeatherAPI.get_daily_forecast_condensed("Nagpur", "MH", "IN", cnt=7)
-    print("Condensed daily forecast:", daily_forecast)
-    
-    # Get condensed historical weather (daily intervals)
-    historical_weather = OpenWeatherAPI.get_historical_weather_condensed(
-        "Nagpur", "MH", "IN", 
+    # Geocode once and fetch every lookup for the location concurrently
+    bundle = OpenWeatherAPI.get_weather_bundle(
+        "Nagpur", "MH", "IN",
+        interval_hours=6,
+        cnt=7,
         start_date="2025-03-01", 
         end_date="2025-03-31",
-        interval_hours=24  # Daily intervals
+        history_interval_hours=24  # Daily intervals
     )
-    print("Condensed historical weather:", historical_weather)
-    
-    # Get condensed air pollution data
-    air_pollution = OpenWeatherAPI.get_air_pollution_condensed("Nagpur", "MH", "IN")
-    print("Condensed air pollution data:", air_pollution)
\ No newline at end of file
+    if bundle is None:
+        print("Location not found: Nagpur, MH, IN")
+    else:
+        print("Current weather:", bundle['current'])
+        print("Condensed hourly forecast:", bundle['hourly'])
+        print("Condensed daily forecast:", bundle['daily'])
+        print("Condensed historical weather:", bundle['historical'])
+        print("Condensed air pollution data:", bundle['air_pollution'])
@@ -1,9 +1,18 @@
 import os
-from typing import List
+import functools
+import inspect
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
 from pydantic import BaseModel
 from openai import OpenAI
 from dotenv import load_dotenv
 
+try:
+    from diskcache import Cache as _DiskCache
+except ImportError:  # diskcache is optional; answers are then cached for this process only
+    _DiskCache = None
+
 load_dotenv()
 
 # Access variables
@@ -13,6 +22,49 @@ BASE_URL = os.getenv("BASE_URL")
 # Initialize the OpenAI client
 client = OpenAI(api_key=API_KEY, base_url=BASE_URL)
 
+# The answers depend only on the arguments, so repeat questions are served
+# from a cache instead of another LLM call. With diskcache installed the cache
+# survives restarts; AGRIINFO_CACHE_DIR overrides its location.
+CACHE_TTL = 7 * 24 * 3600
+if _DiskCache is not None:
+    _cache = _DiskCache(os.getenv("AGRIINFO_CACHE_DIR", os.path.expanduser("~/.cache/finrobot/agriinfo")))
+else:
+    from cachetools import TTLCache
+    _cache = TTLCache(maxsize=256, ttl=CACHE_TTL)
+_cache_lock = threading.Lock()
+
+
+def _cached(model_cls):
+    """Caches a lookup's parsed answer as JSON, keyed by method name and arguments."""
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # Agents call tools with keyword arguments; normalize so both
+            # calling styles share an entry
+            key = (func.__name__, tuple(signature.bind(*args, **kwargs).arguments.values()))
+            with _cache_lock:
+                cached = _cache.get(key)
+            if cached is not None:
+                # Rebuilt on every hit, so callers never share a mutable model
+                return model_cls.model_validate_json(cached)
+            result = func(*args, **kwargs)
+            # A refusal parses to None; let the next call ask again
+            if result is not None:
+                _cache_put(key, result)
+            return result
+        return wrapper
+    return decorator
+
+
+def _cache_put(key: tuple, model: BaseModel) -> None:
+    with _cache_lock:
+        if _DiskCache is not None:
+            _cache.set(key, model.model_dump_json(), expire=CACHE_TTL)
+        else:
+            _cache[key] = model.model_dump_json()
+
 # Define Pydantic models for structured responses
 class Nutrients(BaseModel):
     Nitrogen: str
@@ -52,9 +104,16 @@ class SoilCropCompatibility(BaseModel):
     compatibility: str
     reasoning: str
 
+class AgriCombined(BaseModel):
+    soil: SoilInfo
+    crop: CropInfo
+    diseases: CropDiseaseInfo
+    compatibility: SoilCropCompatibility
+
 # Define the service class with static methods
 class AgriInfoService:
     @staticmethod
+    @_cached(SoilInfo)
     def get_soil_info(location: str) -> SoilInfo:
         completion = client.beta.chat.completions.parse(
             model="gemini-2.0-flash",
@@ -67,6 +126,7 @@ class AgriInfoService:
         return completion.choices[0].message.parsed
 
     @staticmethod
+    @_cached(CropInfo)
     def get_crop_info(crop_name: str) -> CropInfo:
         completion = client.beta.chat.completions.parse(
             model="gemini-2.0-flash",
@@ -79,6 +139,7 @@ class AgriInfoService:
         return completion.choices[0].message.parsed
 
     @staticmethod
+    @_cached(CropDiseaseInfo)
     def get_crop_disease_info(crop_name: str, location: str) -> CropDiseaseInfo:
         completion = client.beta.chat.completions.parse(
             model="gemini-2.0-flash",
@@ -91,6 +152,7 @@ class AgriInfoService:
         return completion.choices[0].message.parsed
 
     @staticmethod
+    @_cached(SoilCropCompatibility)
     def get_soil_crop_compatibility(crop_name: str, location: str) -> SoilCropCompatibility:
         completion = client.beta.chat.completions.parse(
             model="gemini-2.0-flash",
@@ -102,23 +164,67 @@ class AgriInfoService:
         )
         return completion.choices[0].message.parsed
 
+    @staticmethod
+    @_cached(AgriCombined)
+    def _get_combined_info(location: str, crop_name: str) -> AgriCombined:
+        completion = client.beta.chat.completions.parse(
+            model="gemini-2.0-flash",
+            messages=[
+                {"role": "system", "content": "Extract structured soil, crop, crop disease and soil-crop compatibility information from the input."},
+                {"role": "user", "content": (
+                    f"Provide the soil type and detailed soil properties including pH, moisture content, organic matter, and nutrient levels for {location}. "
+                    f"Provide detailed information for the crop {crop_name}, including optimal soil type, pH range, water requirements, nutrient requirements, and growing season. "
+                    f"List common diseases affecting {crop_name} in {location}, including symptoms, causes, prevention, and treatment. "
+                    f"Evaluate the compatibility of growing {crop_name} in {location}, including reasoning."
+                )},
+            ],
+            response_format=AgriCombined,
+        )
+        return completion.choices[0].message.parsed
+
+    @staticmethod
+    def get_all_info(location: str, crop_name: str) -> Dict[str, BaseModel]:
+        """Gets all four lookups in one LLM request; keys are 'soil', 'crop', 'diseases' and 'compatibility'."""
+        combined = AgriInfoService._get_combined_info(location, crop_name)
+        if combined is not None:
+            # Seed the single-lookup caches so later individual calls are free
+            _cache_put(('get_soil_info', (location,)), combined.soil)
+            _cache_put(('get_crop_info', (crop_name,)), combined.crop)
+            _cache_put(('get_crop_disease_info', (crop_name, location)), combined.diseases)
+            _cache_put(('get_soil_crop_compatibility', (crop_name, location)), combined.compatibility)
+            return {
+                'soil': combined.soil,
+                'crop': combined.crop,
+                'diseases': combined.diseases,
+                'compatibility': combined.compatibility,
+            }
+
+        # The combined answer was refused; fall back to the separate lookups, concurrently
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                'soil': executor.submit(AgriInfoService.get_soil_info, location),
+                'crop': executor.submit(AgriInfoService.get_crop_info, crop_name),
+                'diseases': executor.submit(AgriInfoService.get_crop_disease_info, crop_name, location),
+                'compatibility': executor.submit(AgriInfoService.get_soil_crop_compatibility, crop_name, location),
+            }
+            return {name: future.result() for name, future in futures.items()}
+
 # Example usage:
 if __name__ == "__main__":
     location = "Gadchiroli, India"
     crop = "Rice"
 
-    soil_data = AgriInfoService.get_soil_info(location)
+    # One request covers all four lookups
+    info = AgriInfoService.get_all_info(location, crop)
+
     print("Soil Information:")
-    print(soil_data)
+    print(info['soil'])
 
-    crop_data = AgriInfoService.get_crop_info(crop)
     print("\nCrop Information:")
-    print(crop_data)
+    print(info['crop'])
 
-    disease_data = AgriInfoService.get_crop_disease_info(crop, location)
     print("\nCrop Disease Information:")
-    print(disease_data)
+    print(info['diseases'])
 
-    compatibility_data = AgriInfoService.get_soil_crop_compatibility(crop, location)
     print("\nSoil-Crop Compatibility:")
-    print(compatibility_data)
+    print(info['compatibility'])
@@ -17,22 +17,211 @@ import os
 import argparse
 from datetime import datetime, timedelta
 import json
+import re
+import inspect
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import requests
-import matplotlib.pyplot as plt
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+# Figures are drawn straight onto an Agg canvas; pyplot (its backend
+# selection and global figure registry) is never needed here
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import matplotlib.dates as mdates
 import pandas as pd
 import numpy as np
 from io import BytesIO
 import base64
+from types import MappingProxyType
+import hashlib
+from cachetools import LRUCache, TTLCache
 from dotenv import load_dotenv
 
+try:
+    from orjson import loads as _json_loads, dumps as _orjson_dumps, OPT_INDENT_2, OPT_SERIALIZE_NUMPY
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    _json_loads = json.loads
+    _orjson_dumps = None
+
+try:
+    from diskcache import Cache as _DiskCache
+except ImportError:  # diskcache is optional; geocodes are then cached for this process only
+    _DiskCache = None
+
 load_dotenv()
 # Access variables
 API_KEY = os.getenv("API_KEY")
 BASE_URL = os.getenv("BASE_URL")
 # Initialize the OpenAI client
 client = OpenAI(api_key=API_KEY, base_url=BASE_URL)
+
+# "lat, lon" input, optionally followed by further comma-separated fields
+# (which are ignored); anything else is looked up as a place name
+_NUMBER = r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?"
+_COORDINATES_RE = re.compile(rf"\s*({_NUMBER})\s*,\s*({_NUMBER})\s*(?:,.*)?$", re.DOTALL)
+
+# (connect, read) seconds; long Open-Meteo ranges can take a while to build
+REQUEST_TIMEOUT = (3, 30)
+
+
+def _create_session() -> requests.Session:
+    """Creates a pooled session so repeated calls reuse the same TCP/TLS connection."""
+    session = requests.Session()
+    # Timeouts, rate limiting and server errors are retried with exponential
+    # backoff, and a Retry-After from the server (OpenWeatherMap quota,
+    # Nominatim) is honoured. Once retries run out the last response is
+    # returned, not raised, so callers still report its status code
+    retry_options = dict(total=3, backoff_factor=0.5,
+                         status_forcelist=(408, 429, 500, 502, 503, 504),
+                         allowed_methods=("GET",), respect_retry_after_header=True, raise_on_status=False)
+    # Jitter keeps concurrent callers from retrying in lockstep; it needs
+    # urllib3 2.x, while the conda environment pins 1.26
+    if "backoff_jitter" in inspect.signature(Retry).parameters:
+        retry_options["backoff_jitter"] = 0.3
+    retry = Retry(**retry_options)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_session = _create_session()
+
+# Nominatim answers for a place name or coordinate pair practically never
+# change, and its usage policy allows one request per second, so they are
+# cached. With diskcache installed the cache survives restarts;
+# SOLARWIND_CACHE_DIR overrides its location.
+GEOCODE_CACHE_TTL = 30 * 24 * 3600
+if _DiskCache is not None:
+    _geocode_cache = _DiskCache(os.getenv("SOLARWIND_CACHE_DIR", os.path.expanduser("~/.cache/finrobot/solarwind")))
+else:
+    _geocode_cache = TTLCache(maxsize=4096, ttl=GEOCODE_CACHE_TTL)
+_cache_lock = threading.Lock()
+
+
+def _geocode_cache_get(key):
+    with _cache_lock:
+        return _geocode_cache.get(key)
+
+
+def _geocode_cache_set(key, value):
+    with _cache_lock:
+        if _DiskCache is not None:
+            _geocode_cache.set(key, value, expire=GEOCODE_CACHE_TTL)
+        else:
+            _geocode_cache[key] = value
+
+
+def _hourly_to_arrays(data):
+    """Converts an Open-Meteo hourly block to NumPy arrays in place; null readings become NaN."""
+    hourly = data.get("hourly") or {}
+    for key, values in hourly.items():
+        hourly[key] = np.asarray(values, dtype="datetime64[m]" if key == "time" else np.float64)
+    return data
+
+
+# Nominatim's usage policy allows at most one request per second per client;
+# uncached lookups wait for their slot, so batches of locations stay within it
+NOMINATIM_MIN_INTERVAL = 1.0
+_nominatim_lock = threading.Lock()
+_nominatim_last_request = 0.0
+
+
+def _nominatim_wait():
+    global _nominatim_last_request
+    with _nominatim_lock:
+        delay = _nominatim_last_request + NOMINATIM_MIN_INTERVAL - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        _nominatim_last_request = time.monotonic()
+
+
+# Seconds a cached API response stays fresh. Overlapping or repeated queries
+# (the same site re-assessed, solar and wind plotted separately) are then
+# served from memory. OpenWeatherMap refreshes current conditions every few
+# minutes and forecasts hourly; Open-Meteo updates its models hourly.
+RESPONSE_CACHE_TTLS = {
+    "open_meteo": 60 * 60,
+    "owm_weather": 10 * 60,
+    "owm_forecast": 60 * 60,
+}
+_response_caches = {name: TTLCache(maxsize=256, ttl=ttl) for name, ttl in RESPONSE_CACHE_TTLS.items()}
+
+
+def _response_cache_get(name, key):
+    with _cache_lock:
+        return _response_caches[name].get(key)
+
+
+def _response_cache_set(name, key, value):
+    with _cache_lock:
+        _response_caches[name][key] = value
+
+def _local_time_strings(timestamps):
+    """Formats Unix timestamps as local-time 'YYYY-MM-DDTHH:MM' strings."""
+    # time.localtime/strftime skip building datetime objects; for a forecast's
+    # ~40 steps this also beats a vectorized pandas conversion, whose fixed
+    # setup cost dominates at that size
+    return [time.strftime('%Y-%m-%dT%H:%M', time.localtime(timestamp)) for timestamp in timestamps]
+
+
+def _daily_records(days, columns):
+    """Builds one record per day from whole columns, rounded to 2 decimals with missing values as None."""
+    names = list(columns)
+    # Python's round() is kept (np.round can differ in the last digit); NaN
+    # is the only value not equal to itself
+    values = [
+        [None if value != value else round(value, 2) for value in np.asarray(column, dtype=float).tolist()]
+        for column in columns.values()
+    ]
+    return [{"date": str(day), **dict(zip(names, row))} for day, row in zip(days, zip(*values))]
+
+
+def _records_frame(records, label):
+    """Returns the daily records as a DataFrame with a parsed "timestamp" column."""
+    df = pd.DataFrame(records)
+    if "date" in df.columns:
+        # The formatters always write ISO dates; a fixed format skips inference
+        df["timestamp"] = pd.to_datetime(df["date"], format="%Y-%m-%d")
+    elif "time" in df.columns:
+        df["timestamp"] = pd.to_datetime(df["time"])
+    else:
+        raise ValueError(f"No date/time column found in {label} data")
+    return df
+
+
+# Resolution of figures returned as base64 rather than written to a file.
+# They are meant for inline display, where 150 dpi is already sharper than
+# the screen; it draws about twice as fast as 300 dpi and the PNG is less
+# than half the size. Files keep 300 dpi for print.
+INLINE_FIGURE_DPI = 150
+
+# Base64 PNGs of recently drawn figures, keyed by a digest of what they show.
+# One result is often rendered for several outputs (report, API response),
+# and hashing the inputs is far cheaper than drawing a 300 dpi figure again.
+_render_cache = LRUCache(maxsize=16)
+
+
+def _render_key(kind, *parts):
+    """Returns a digest identifying a figure by its kind and the data drawn in it."""
+    if _orjson_dumps is not None:
+        payload = _orjson_dumps([kind, *parts], default=str)
+    else:
+        payload = json.dumps([kind, *parts], default=str).encode()
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def _render_cache_get(key):
+    with _cache_lock:
+        return _render_cache.get(key)
+
+
+def _render_cache_set(key, value):
+    with _cache_lock:
+        _render_cache[key] = value
+
 # Define a response model matching the static method output
 # Define structured response models for solar and wind energy
 class SolarEnergy(BaseModel):
@@ -66,6 +255,9 @@ class SolarWind:
     OPENWEATHERMAP_API_KEY = os.getenv("OWM_API_KEY")
     OPEN_METEO_BASE_URL = "https://api.open-meteo.com/v1/forecast"
     OPENWEATHERMAP_BASE_URL = "https://api.openweathermap.org/data"
+    OPEN_METEO_LIMIT = datetime(2016, 1, 1)  # Earliest date Open-Meteo serves
+    OPEN_METEO_SOLAR_VARIABLES = ("direct_radiation", "diffuse_radiation", "direct_normal_irradiance", "shortwave_radiation")
+    OPEN_METEO_WIND_VARIABLES = ("wind_speed_10m", "wind_speed_100m", "wind_direction_10m", "wind_direction_100m", "wind_gusts_10m")
     
     # Thresholds for renewable energy suitability
     SOLAR_THRESHOLDS = {
@@ -82,14 +274,28 @@ class SolarWind:
         "poor": 2.0
     }
     
+    # Radar-chart score of each suitability rating; unknown ratings plot as 0
+    _SUITABILITY_SCORE = MappingProxyType({"Excellent": 4, "Good": 3, "Moderate": 2, "Poor": 1, "Unsuitable": 0, "Unknown": 0})
+    
+    # Coefficients of the OpenWeatherMap solar estimate (W/m², clouds in %),
+    # indexed by whether the sky is clear or mostly clear (weather id >= 800):
+    # direct = max(0, base - slope * clouds), diffuse = base + slope * clouds
+    _OWM_DIRECT_BASE = np.array([500, 1000])
+    _OWM_DIRECT_SLOPE = 5
+    _OWM_DIFFUSE_BASE = np.array([300, 200])
+    _OWM_DIFFUSE_SLOPE = np.array([2, 3])
+    
     @staticmethod
-    def process_location_input(location_input):
+    def process_location_input(location_input, resolve_name=True):
         """
         Process location input to extract latitude and longitude.
         
         Args:
             location_input (str): Location as coordinates (e.g., '40.7128, -74.0060') 
                                  or place name (e.g., 'New York City')
+            resolve_name (bool, optional): Look up a place name for coordinate input
+                                 via reverse geocoding. When False, location_name is
+                                 None for coordinate input. Defaults to True.
         
         Returns:
             dict: Dictionary containing latitude, longitude, and location name
@@ -99,30 +305,21 @@ class SolarWind:
         """
         try:
             # Check if input is coordinates
-            if ',' in location_input and any(c.isdigit() for c in location_input):
-                # Split by comma and strip whitespace
-                parts = [p.strip() for p in location_input.split(',')]
+            match = _COORDINATES_RE.match(location_input)
+            if match:
+                latitude = float(match.group(1))
+                longitude = float(match.group(2))
                 
-                if len(parts) >= 2:
-                    try:
-                        latitude = float(parts[0])
-                        longitude = float(parts[1])
-                        
-                        # Validate coordinates
-                        if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
-                            raise ValueError("Invalid coordinate values")
-                        
-                        # Try to get location name using reverse geocoding
-                        location_name = SolarWind._reverse_geocode(latitude, longitude)
-                        
-                        return {
-                            "latitude": latitude,
-                            "longitude": longitude,
-                            "location_name": location_name
-                        }
-                    except ValueError:
-                        # If conversion fails, treat as place name
-                        pass
+                # Validate coordinates; out-of-range pairs are treated as a place name
+                if -90 <= latitude <= 90 and -180 <= longitude <= 180:
+                    # Try to get location name using reverse geocoding
+                    location_name = SolarWind._reverse_geocode(latitude, longitude) if resolve_name else None
+                    
+                    return {
+                        "latitude": latitude,
+                        "longitude": longitude,
+                        "location_name": location_name
+                    }
             
             # If not coordinates or conversion failed, treat as place name
             geocode_result = SolarWind._geocode(location_input)
@@ -136,6 +333,34 @@ class SolarWind:
         except Exception as e:
             raise ValueError(f"Could not process location input. Please provide valid coordinates or a place name. Error: {str(e)}")
     
+    @staticmethod
+    def process_locations_input(locations, resolve_names=True):
+        """
+        Process several location inputs, e.g. for screening many candidate sites.
+        
+        Nominatim has no batch endpoint, so names are resolved one at a time
+        within its one-request-per-second limit. Repeated inputs are resolved
+        once, and anything already cached costs no request at all.
+        
+        Args:
+            locations (list): Location inputs accepted by process_location_input
+            resolve_names (bool, optional): Reverse geocode coordinate inputs to a
+                                 place name. Skipping it saves a rate-limited request
+                                 per coordinate pair. Defaults to True.
+        
+        Returns:
+            list: One location dictionary per input, in input order
+        
+        Raises:
+            ValueError: If a location input cannot be processed
+        """
+        resolved = {}
+        for location_input in locations:
+            if location_input not in resolved:
+                resolved[location_input] = SolarWind.process_location_input(location_input, resolve_names)
+        # Separate dicts per entry, so editing one result doesn't change its duplicates
+        return [dict(resolved[location_input]) for location_input in locations]
+    
     @staticmethod
     def _geocode(place_name):
         """
@@ -150,6 +375,12 @@ class SolarWind:
         Raises:
             ValueError: If geocoding fails
         """
+        # Spelling variants of the same query share an entry
+        cache_key = ("search", " ".join(place_name.split()).casefold())
+        cached = _geocode_cache_get(cache_key)
+        if cached is not None:
+            return dict(cached)
+
         try:
             # Use Nominatim API for geocoding
             url = "https://nominatim.openstreetmap.org/search"
@@ -162,23 +393,26 @@ class SolarWind:
                 "User-Agent": f"{SolarWind.NAME}/{SolarWind.VERSION}"
             }
             
-            response = requests.get(url, params=params, headers=headers)
+            _nominatim_wait()
+            response = _session.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
             
             if response.status_code != 200:
                 raise ValueError(f"Geocoding API request failed with status code {response.status_code}")
             
-            data = response.json()
+            data = _json_loads(response.content)
             
             if not data:
                 raise ValueError(f"No results found for location: {place_name}")
             
             result = data[0]
             
-            return {
+            geocoded = {
                 "latitude": float(result["lat"]),
                 "longitude": float(result["lon"]),
                 "location_name": result.get("display_name", place_name).split(',')[0]
             }
+            _geocode_cache_set(cache_key, geocoded)
+            return dict(geocoded)
         
         except Exception as e:
             raise ValueError(f"Unexpected error during geocoding: {str(e)}")
@@ -195,6 +429,12 @@ class SolarWind:
         Returns:
             str: Name of the location
         """
+        # 4 decimals is ~10 m, well inside a single named place
+        cache_key = ("reverse", round(latitude, 4), round(longitude, 4))
+        cached = _geocode_cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             # Use Nominatim API for reverse geocoding
             url = "https://nominatim.openstreetmap.org/reverse"
@@ -207,16 +447,22 @@ class SolarWind:
                 "User-Agent": f"{SolarWind.NAME}/{SolarWind.VERSION}"
             }
             
-            response = requests.get(url, params=params, headers=headers)
+            _nominatim_wait()
+            response = _session.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT)
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json_loads(response.content)
+                name = None
                 if "name" in data:
-                    return data["name"]
+                    name = data["name"]
                 elif "display_name" in data:
-                    return data["display_name"].split(',')[0]
+                    name = data["display_name"].split(',')[0]
+                if name is not None:
+                    _geocode_cache_set(cache_key, name)
+                    return name
             
-            # If reverse geocoding fails, return coordinates as string
+            # If reverse geocoding fails, return coordinates as string (not
+            # cached, so the next call tries again)
             return f"{latitude}, {longitude}"
         
         except Exception:
@@ -244,13 +490,19 @@ class SolarWind:
         try:
             # Process location input
             print(f"Processing location: {location}")
-            location_info = SolarWind.process_location_input(location)
+            location_info = SolarWind.process_location_input(location, resolve_name=False)
             
             latitude = location_info["latitude"]
             longitude = location_info["longitude"]
-            location_name = location_info.get("location_name", f"{latitude}, {longitude}")
             
-            print(f"Resolved location: {location_name} ({latitude}, {longitude})")
+            # For coordinate input the place name only labels the output, so
+            # reverse geocoding runs alongside the data requests instead of
+            # ahead of them
+            name_future = None
+            if location_info["location_name"] is None:
+                name_executor = ThreadPoolExecutor(max_workers=1)
+                name_future = name_executor.submit(SolarWind._reverse_geocode, latitude, longitude)
+                name_executor.shutdown(wait=False)
             
             # Set default dates if not provided
             if not start_date:
@@ -259,14 +511,13 @@ class SolarWind:
                 end_date = datetime.now().strftime('%Y-%m-%d')
             
             # Determine which API to use
-            start_dt = datetime.strptime(start_date, '%Y-%m-%d')
-            open_meteo_limit = datetime(2016, 1, 1)
+            start_dt = datetime.fromisoformat(start_date)
             owm_history_limit = datetime.now() - timedelta(days=365)  # Last year only
             
             use_openweathermap = force_owm
             
             if not use_openweathermap:
-                if start_dt < open_meteo_limit:
+                if start_dt < SolarWind.OPEN_METEO_LIMIT:
                     if start_dt >= owm_history_limit:
                         use_openweathermap = True
                     else:
@@ -291,6 +542,10 @@ class SolarWind:
                 use_openweathermap=use_openweathermap
             )
             
+            if name_future is not None:
+                location_info["location_name"] = name_future.result()
+            print(f"Resolved location: {location_info['location_name']} ({latitude}, {longitude})")
+            
             # Format the data
             print("Formatting data...")
             formatted_data = SolarWind._format_combined_data(
@@ -315,57 +570,69 @@ class SolarWind:
             raise ValueError(f"Error retrieving data: {str(e)}")
     
     @staticmethod
-    def _get_combined_data(latitude, longitude, start_date, end_date, use_openweathermap=False, retry_count=3, retry_delay=2):
+    def _get_combined_data(latitude, longitude, start_date, end_date, use_openweathermap=False):
         """
         Retrieve both solar radiation and wind data for a given location.
         
+        Each source is requested once and shared by the solar and wind data.
+        Transient HTTP failures are retried by the shared session.
+        
         Args:
             latitude (float): Latitude of the location
             longitude (float): Longitude of the location
             start_date (str): Start date in YYYY-MM-DD format
             end_date (str): End date in YYYY-MM-DD format
             use_openweathermap (bool, optional): Force use of OpenWeatherMap API. Defaults to False.
-            retry_count (int, optional): Number of retry attempts. Defaults to 3.
-            retry_delay (int, optional): Delay between retries in seconds. Defaults to 2.
         
         Returns:
             dict: Dictionary containing both solar and wind data
         
         Raises:
-            ValueError: If there's an error retrieving the data after all retries
+            ValueError: If both solar and wind data could not be retrieved
         """
         solar_data = None
         wind_data = None
         solar_error = None
         wind_error = None
         
-        # Retry mechanism for solar data
-        for attempt in range(retry_count):
+        if use_openweathermap:
+            # Solar and wind are both estimated from the same current weather
+            # and forecast payloads, so each endpoint is fetched once and the
+            # two requests run concurrently
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                current_future = executor.submit(SolarWind._get_current_weather_owm, latitude, longitude)
+                forecast_future = executor.submit(SolarWind._get_forecast_owm, latitude, longitude)
+            
             try:
-                if use_openweathermap:
-                    solar_data = SolarWind._get_solar_data_openweathermap(latitude, longitude, start_date, end_date)
-                else:
-                    solar_data = SolarWind._get_solar_data_openmeteo(latitude, longitude, start_date, end_date)
-                solar_error = None
-                break
+                current_data = current_future.result()
+                forecast_data = forecast_future.result()
             except Exception as e:
-                solar_error = str(e)
-                if attempt < retry_count - 1:
-                    time.sleep(retry_delay)
-        
-        # Retry mechanism for wind data
-        for attempt in range(retry_count):
+                solar_error = f"Error retrieving solar radiation data from OpenWeatherMap: {str(e)}"
+                wind_error = f"Error retrieving wind data from OpenWeatherMap: {str(e)}"
+            else:
+                try:
+                    solar_data = SolarWind._get_solar_data_openweathermap(
+                        latitude, longitude, start_date, end_date, current_data, forecast_data
+                    )
+                except Exception as e:
+                    solar_error = str(e)
+                
+                try:
+                    wind_data = SolarWind._get_wind_data_openweathermap(
+                        latitude, longitude, start_date, end_date, current_data, forecast_data
+                    )
+                except Exception as e:
+                    wind_error = str(e)
+        else:
+            # Solar and wind variables come from the same Open-Meteo endpoint,
+            # so one request returns both and is split locally
             try:
-                if use_openweathermap:
-                    wind_data = SolarWind._get_wind_data_openweathermap(latitude, longitude, start_date, end_date)
-                else:
-                    wind_data = SolarWind._get_wind_data_openmeteo(latitude, longitude, start_date, end_date)
-                wind_error = None
-                break
+                openmeteo_data = SolarWind._get_openmeteo_data(latitude, longitude, start_date, end_date)
             except Exception as e:
-                wind_error = str(e)
-                if attempt < retry_count - 1:
-                    time.sleep(retry_delay)
+                solar_error = wind_error = str(e)
+            else:
+                solar_data = SolarWind._select_openmeteo_variables(openmeteo_data, SolarWind.OPEN_METEO_SOLAR_VARIABLES)
+                wind_data = SolarWind._select_openmeteo_variables(openmeteo_data, SolarWind.OPEN_METEO_WIND_VARIABLES)
         
         # Check if both retrievals failed
         if solar_error and wind_error:
@@ -398,9 +665,12 @@ class SolarWind:
         return result
     
     @staticmethod
-    def _get_solar_data_openmeteo(latitude, longitude, start_date, end_date):
+    def _get_openmeteo_data(latitude, longitude, start_date, end_date):
         """
-        Retrieve solar radiation data from Open-Meteo API.
+        Retrieve solar radiation and wind data from Open-Meteo API in one request.
+        
+        Both data sets come from the same endpoint for the same location and
+        dates, so all hourly variables are requested together.
         
         Args:
             latitude (float): Latitude of the location
@@ -409,31 +679,38 @@ class SolarWind:
             end_date (str): End date in YYYY-MM-DD format
         
         Returns:
-            dict: JSON response containing solar radiation data
+            dict: JSON response containing solar radiation and wind data
         
         Raises:
             ValueError: If there's an error retrieving the data
         """
         try:
-            # Construct the API URL for solar radiation data
             params = {
                 "latitude": latitude,
                 "longitude": longitude,
-                "hourly": "direct_radiation,diffuse_radiation,direct_normal_irradiance,shortwave_radiation",
+                "hourly": ",".join(SolarWind.OPEN_METEO_SOLAR_VARIABLES + SolarWind.OPEN_METEO_WIND_VARIABLES),
                 "start_date": start_date,
                 "end_date": end_date,
                 "timezone": "GMT"
             }
             
+            cache_key = tuple(params.values())
+            data = _response_cache_get("open_meteo", cache_key)
+            if data is not None:
+                return data
+            
             # Make the API request
-            response = requests.get(SolarWind.OPEN_METEO_BASE_URL, params=params)
+            response = _session.get(SolarWind.OPEN_METEO_BASE_URL, params=params, timeout=REQUEST_TIMEOUT)
             
             # Check if the request was successful
             if response.status_code != 200:
                 raise ValueError(f"API request failed with status code {response.status_code}: {response.text}")
             
-            # Parse the JSON response
-            data = response.json()
+            # Parse the JSON response. Hourly series hold thousands of
+            # readings; as float64 arrays they take a fraction of the memory
+            # of lists of floats and are averaged without a Python-level pass
+            data = _hourly_to_arrays(_json_loads(response.content))
+            _response_cache_set("open_meteo", cache_key, data)
             
             # Return the data
             return data
@@ -443,10 +720,48 @@ class SolarWind:
         except json.JSONDecodeError as e:
             raise ValueError(f"Error parsing JSON response: {str(e)}")
         except Exception as e:
-            raise ValueError(f"Unexpected error retrieving solar radiation data from Open-Meteo: {str(e)}")
+            raise ValueError(f"Unexpected error retrieving data from Open-Meteo: {str(e)}")
+    
+    @staticmethod
+    def _select_openmeteo_variables(data, variables):
+        """
+        Restrict an Open-Meteo response to the given hourly variables.
+        
+        Args:
+            data (dict): Open-Meteo response
+            variables (tuple): Hourly variables to keep, besides time
+        
+        Returns:
+            dict: Shallow copy of the response with only those hourly variables
+        """
+        selected = dict(data)
+        for block in ("hourly", "hourly_units"):
+            if block in data:
+                selected[block] = {key: data[block][key] for key in ("time", *variables) if key in data[block]}
+        return selected
+    
+    @staticmethod
+    def _get_solar_data_openmeteo(latitude, longitude, start_date, end_date):
+        """
+        Retrieve solar radiation data from Open-Meteo API.
+        
+        Args:
+            latitude (float): Latitude of the location
+            longitude (float): Longitude of the location
+            start_date (str): Start date in YYYY-MM-DD format
+            end_date (str): End date in YYYY-MM-DD format
+        
+        Returns:
+            dict: JSON response containing solar radiation data
+        
+        Raises:
+            ValueError: If there's an error retrieving the data
+        """
+        data = SolarWind._get_openmeteo_data(latitude, longitude, start_date, end_date)
+        return SolarWind._select_openmeteo_variables(data, SolarWind.OPEN_METEO_SOLAR_VARIABLES)
     
     @staticmethod
-    def _get_solar_data_openweathermap(latitude, longitude, start_date, end_date):
+    def _get_solar_data_openweathermap(latitude, longitude, start_date, end_date, current_data=None, forecast_data=None):
         """
         Retrieve solar radiation data from OpenWeatherMap API.
         
@@ -455,6 +770,8 @@ class SolarWind:
             longitude (float): Longitude of the location
             start_date (str): Start date in YYYY-MM-DD format
             end_date (str): End date in YYYY-MM-DD format
+            current_data (dict, optional): Already fetched current weather data. Fetched if omitted.
+            forecast_data (dict, optional): Already fetched forecast data. Fetched if omitted.
         
         Returns:
             dict: JSON response containing solar radiation data
@@ -466,10 +783,12 @@ class SolarWind:
             # For current subscription, we'll use the forecast and current data
             
             # Get current weather data
-            current_data = SolarWind._get_current_weather_owm(latitude, longitude)
+            if current_data is None:
+                current_data = SolarWind._get_current_weather_owm(latitude, longitude)
             
             # Get forecast data
-            forecast_data = SolarWind._get_forecast_owm(latitude, longitude)
+            if forecast_data is None:
+                forecast_data = SolarWind._get_forecast_owm(latitude, longitude)
             
             # Format the data to match Open-Meteo structure as closely as possible
             formatted_data = SolarWind._format_owm_current_forecast_to_solar(
@@ -498,6 +817,11 @@ class SolarWind:
             ValueError: If there's an error retrieving the data
         """
         try:
+            cache_key = (latitude, longitude, units)
+            data = _response_cache_get("owm_weather", cache_key)
+            if data is not None:
+                return data
+            
             url = f"{SolarWind.OPENWEATHERMAP_BASE_URL}/2.5/weather"
             
             params = {
@@ -507,12 +831,14 @@ class SolarWind:
                 "units": units
             }
             
-            response = requests.get(url, params=params)
+            response = _session.get(url, params=params, timeout=REQUEST_TIMEOUT)
             
             if response.status_code != 200:
                 raise ValueError(f"API request failed with status code {response.status_code}: {response.text}")
             
-            return response.json()
+            data = _json_loads(response.content)
+            _response_cache_set("owm_weather", cache_key, data)
+            return data
             
         except requests.exceptions.RequestException as e:
             raise ValueError(f"Error making request to OpenWeatherMap API: {str(e)}")
@@ -538,6 +864,11 @@ class SolarWind:
             ValueError: If there's an error retrieving the data
         """
         try:
+            cache_key = (latitude, longitude, units)
+            data = _response_cache_get("owm_forecast", cache_key)
+            if data is not None:
+                return data
+            
             url = f"{SolarWind.OPENWEATHERMAP_BASE_URL}/2.5/forecast"
             
             params = {
@@ -547,12 +878,14 @@ class SolarWind:
                 "units": units
             }
             
-            response = requests.get(url, params=params)
+            response = _session.get(url, params=params, timeout=REQUEST_TIMEOUT)
             
             if response.status_code != 200:
                 raise ValueError(f"API request failed with status code {response.status_code}: {response.text}")
             
-            return response.json()
+            data = _json_loads(response.content)
+            _response_cache_set("owm_forecast", cache_key, data)
+            return data
             
         except requests.exceptions.RequestException as e:
             raise ValueError(f"Error making request to OpenWeatherMap API: {str(e)}")
@@ -596,56 +929,27 @@ class SolarWind:
             }
         }
         
-        # Process current data
-        if "dt" in current_data:
-            current_dt = datetime.fromtimestamp(current_data["dt"])
-            time_str = current_dt.strftime('%Y-%m-%dT%H:%M')
-            formatted_data["hourly"]["time"].append(time_str)
-            
-            # Extract solar data from current weather
-            # Note: OpenWeatherMap current data doesn't directly provide solar radiation
-            # We'll use weather conditions as a proxy
-            clouds = current_data.get("clouds", {}).get("all", 0)
-            weather_id = current_data.get("weather", [{}])[0].get("id", 800)
-            
-            # Estimate solar radiation based on weather conditions
-            # This is a very rough approximation
-            if weather_id >= 800:  # Clear or mostly clear
-                direct_radiation = max(0, 1000 - (clouds * 5))
-                diffuse_radiation = 200 + (clouds * 3)
-            else:  # Cloudy or precipitation
-                direct_radiation = max(0, 500 - (clouds * 5))
-                diffuse_radiation = 300 + (clouds * 2)
-            
-            formatted_data["hourly"]["direct_radiation"].append(direct_radiation)
-            formatted_data["hourly"]["diffuse_radiation"].append(diffuse_radiation)
-            formatted_data["hourly"]["direct_normal_irradiance"].append(direct_radiation)
-            formatted_data["hourly"]["shortwave_radiation"].append(direct_radiation + diffuse_radiation)
-        
-        # Process forecast data
-        if "list" in forecast_data:
-            for forecast in forecast_data["list"]:
-                if "dt" in forecast:
-                    forecast_dt = datetime.fromtimestamp(forecast["dt"])
-                    time_str = forecast_dt.strftime('%Y-%m-%dT%H:%M')
-                    formatted_data["hourly"]["time"].append(time_str)
-                    
-                    # Extract solar data from forecast
-                    clouds = forecast.get("clouds", {}).get("all", 0)
-                    weather_id = forecast.get("weather", [{}])[0].get("id", 800)
-                    
-                    # Estimate solar radiation based on weather conditions
-                    if weather_id >= 800:  # Clear or mostly clear
-                        direct_radiation = max(0, 1000 - (clouds * 5))
-                        diffuse_radiation = 200 + (clouds * 3)
-                    else:  # Cloudy or precipitation
-                        direct_radiation = max(0, 500 - (clouds * 5))
-                        diffuse_radiation = 300 + (clouds * 2)
-                    
-                    formatted_data["hourly"]["direct_radiation"].append(direct_radiation)
-                    formatted_data["hourly"]["diffuse_radiation"].append(diffuse_radiation)
-                    formatted_data["hourly"]["direct_normal_irradiance"].append(direct_radiation)
-                    formatted_data["hourly"]["shortwave_radiation"].append(direct_radiation + diffuse_radiation)
+        # Current conditions followed by the forecast steps, all handled at once
+        items = [item for item in (current_data, *forecast_data.get("list", ())) if "dt" in item]
+        if not items:
+            return formatted_data
+        
+        # OpenWeatherMap doesn't provide solar radiation, so it is estimated
+        # from cloud cover and weather conditions. This is a very rough
+        # approximation.
+        clouds = np.array([item.get("clouds", {}).get("all", 0) for item in items])
+        weather_id = np.array([item.get("weather", [{}])[0].get("id", 800) for item in items])
+        # Index into the coefficient tables instead of branching per step
+        clear = (weather_id >= 800).astype(np.intp)
+        direct_radiation = np.maximum(0, SolarWind._OWM_DIRECT_BASE[clear] - SolarWind._OWM_DIRECT_SLOPE * clouds)
+        diffuse_radiation = SolarWind._OWM_DIFFUSE_BASE[clear] + SolarWind._OWM_DIFFUSE_SLOPE[clear] * clouds
+        
+        hourly = formatted_data["hourly"]
+        hourly["time"] = _local_time_strings(item["dt"] for item in items)
+        hourly["direct_radiation"] = direct_radiation.tolist()
+        hourly["diffuse_radiation"] = diffuse_radiation.tolist()
+        hourly["direct_normal_irradiance"] = hourly["direct_radiation"].copy()
+        hourly["shortwave_radiation"] = (direct_radiation + diffuse_radiation).tolist()
         
         return formatted_data
     
@@ -666,39 +970,11 @@ class SolarWind:
         Raises:
             ValueError: If there's an error retrieving the data
         """
-        try:
-            # Construct the API URL for wind data
-            params = {
-                "latitude": latitude,
-                "longitude": longitude,
-                "hourly": "wind_speed_10m,wind_speed_100m,wind_direction_10m,wind_direction_100m,wind_gusts_10m",
-                "start_date": start_date,
-                "end_date": end_date,
-                "timezone": "GMT"
-            }
-            
-            # Make the API request
-            response = requests.get(SolarWind.OPEN_METEO_BASE_URL, params=params)
-            
-            # Check if the request was successful
-            if response.status_code != 200:
-                raise ValueError(f"API request failed with status code {response.status_code}: {response.text}")
-            
-            # Parse the JSON response
-            data = response.json()
-            
-            # Return the data
-            return data
-        
-        except requests.exceptions.RequestException as e:
-            raise ValueError(f"Error making request to Open-Meteo API: {str(e)}")
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Error parsing JSON response: {str(e)}")
-        except Exception as e:
-            raise ValueError(f"Unexpected error retrieving wind data from Open-Meteo: {str(e)}")
+        data = SolarWind._get_openmeteo_data(latitude, longitude, start_date, end_date)
+        return SolarWind._select_openmeteo_variables(data, SolarWind.OPEN_METEO_WIND_VARIABLES)
     
     @staticmethod
-    def _get_wind_data_openweathermap(latitude, longitude, start_date, end_date):
+    def _get_wind_data_openweathermap(latitude, longitude, start_date, end_date, current_data=None, forecast_data=None):
         """
         Retrieve wind data from OpenWeatherMap API.
         
@@ -707,6 +983,8 @@ class SolarWind:
             longitude (float): Longitude of the location
             start_date (str): Start date in YYYY-MM-DD format
             end_date (str): End date in YYYY-MM-DD format
+            current_data (dict, optional): Already fetched current weather data. Fetched if omitted.
+            forecast_data (dict, optional): Already fetched forecast data. Fetched if omitted.
         
         Returns:
             dict: JSON response containing wind data
@@ -718,10 +996,12 @@ class SolarWind:
             # For current subscription, we'll use the forecast and current data
             
             # Get current weather data
-            current_data = SolarWind._get_current_weather_owm(latitude, longitude)
+            if current_data is None:
+                current_data = SolarWind._get_current_weather_owm(latitude, longitude)
             
             # Get forecast data
-            forecast_data = SolarWind._get_forecast_owm(latitude, longitude)
+            if forecast_data is None:
+                forecast_data = SolarWind._get_forecast_owm(latitude, longitude)
             
             # Format the data to match Open-Meteo structure
             formatted_data = SolarWind._format_owm_current_forecast_to_wind(
@@ -764,35 +1044,13 @@ class SolarWind:
             }
         }
         
-        # Process current data
-        if "dt" in current_data and "wind" in current_data:
-            current_dt = datetime.fromtimestamp(current_data["dt"])
-            time_str = current_dt.strftime('%Y-%m-%dT%H:%M')
-            formatted_data["hourly"]["time"].append(time_str)
-            
-            # Extract wind data
-            wind_data = current_data["wind"]
-            wind_speed = wind_data.get("speed", None)
-            wind_dir = wind_data.get("deg", None)
-            
-            formatted_data["hourly"]["wind_speed_10m"].append(wind_speed)
-            formatted_data["hourly"]["wind_direction_10m"].append(wind_dir)
-        
-        # Process forecast data
-        if "list" in forecast_data:
-            for forecast in forecast_data["list"]:
-                if "dt" in forecast and "wind" in forecast:
-                    forecast_dt = datetime.fromtimestamp(forecast["dt"])
-                    time_str = forecast_dt.strftime('%Y-%m-%dT%H:%M')
-                    formatted_data["hourly"]["time"].append(time_str)
-                    
-                    # Extract wind data
-                    wind_data = forecast["wind"]
-                    wind_speed = wind_data.get("speed", None)
-                    wind_dir = wind_data.get("deg", None)
-                    
-                    formatted_data["hourly"]["wind_speed_10m"].append(wind_speed)
-                    formatted_data["hourly"]["wind_direction_10m"].append(wind_dir)
+        # Current conditions followed by the forecast steps, all handled at once
+        items = [item for item in (current_data, *forecast_data.get("list", ())) if "dt" in item and "wind" in item]
+        
+        hourly = formatted_data["hourly"]
+        hourly["time"] = _local_time_strings(item["dt"] for item in items)
+        hourly["wind_speed_10m"] = [item["wind"].get("speed") for item in items]
+        hourly["wind_direction_10m"] = [item["wind"].get("deg") for item in items]
         
         return formatted_data
     
@@ -816,6 +1074,9 @@ class SolarWind:
             ValueError: If there's an error formatting the data
         """
         try:
+            # One timestamp for the whole document and its sections
+            now_iso = datetime.now().isoformat()
+            
             # Extract location information
             latitude = location_info["latitude"]
             longitude = location_info["longitude"]
@@ -826,8 +1087,8 @@ class SolarWind:
                 "metadata": {
                     "source": "SolarWind Renewable Energy Assessment Tool",
                     "version": SolarWind.VERSION,
-                    "timestamp": datetime.now().isoformat(),
-                    "query_time": datetime.now().isoformat(),
+                    "timestamp": now_iso,
+                    "query_time": now_iso,
                     "data_source": data_source,
                     "start_date": start_date,
                     "end_date": end_date
@@ -845,7 +1106,7 @@ class SolarWind:
                     "error": solar_data["error"]
                 }
             else:
-                formatted_data["solar_irradiance"] = SolarWind._format_solar_data(solar_data)
+                formatted_data["solar_irradiance"] = SolarWind._format_solar_data(solar_data, now_iso)
             
             # Format wind data
             if "error" in wind_data:
@@ -853,7 +1114,7 @@ class SolarWind:
                     "error": wind_data["error"]
                 }
             else:
-                formatted_data["wind"] = SolarWind._format_wind_data(wind_data)
+                formatted_data["wind"] = SolarWind._format_wind_data(wind_data, now_iso)
             
             # Add renewable energy suitability assessment
             formatted_data["renewable_energy_assessment"] = SolarWind.assess_renewable_energy_suitability(
@@ -867,12 +1128,13 @@ class SolarWind:
             raise ValueError(f"Error formatting combined data: {str(e)}")
     
     @staticmethod
-    def _format_solar_data(solar_data):
+    def _format_solar_data(solar_data, now_iso=None):
         """
         Format solar data into a standardized structure.
         
         Args:
             solar_data (dict): Solar radiation data
+            now_iso (str, optional): Timestamp to record. Defaults to the current time.
         
         Returns:
             dict: Formatted solar data
@@ -885,7 +1147,7 @@ class SolarWind:
             formatted_solar = {
                 "metadata": {
                     "source": solar_data.get("data_source", "Open-Meteo API"),
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now_iso or datetime.now().isoformat(),
                     "timezone": solar_data.get("timezone", "GMT"),
                     "timezone_abbreviation": solar_data.get("timezone_abbreviation", "GMT"),
                     "elevation": solar_data.get("elevation", None)
@@ -910,10 +1172,10 @@ class SolarWind:
             
             # Extract hourly data
             times = solar_data["hourly"]["time"]
-            direct = np.array(solar_data["hourly"].get("direct_radiation", [np.nan]*len(times)))
-            diffuse = np.array(solar_data["hourly"].get("diffuse_radiation", [np.nan]*len(times)))
-            dni = np.array(solar_data["hourly"].get("direct_normal_irradiance", [np.nan]*len(times)))
-            shortwave = np.array(solar_data["hourly"].get("shortwave_radiation", [np.nan]*len(times)))
+            direct = np.asarray(solar_data["hourly"].get("direct_radiation", [np.nan]*len(times)), dtype=float)
+            diffuse = np.asarray(solar_data["hourly"].get("diffuse_radiation", [np.nan]*len(times)), dtype=float)
+            dni = np.asarray(solar_data["hourly"].get("direct_normal_irradiance", [np.nan]*len(times)), dtype=float)
+            shortwave = np.asarray(solar_data["hourly"].get("shortwave_radiation", [np.nan]*len(times)), dtype=float)
             
             # Dimensionality reduction: take 24-hour average per day
             df = pd.DataFrame({
@@ -926,24 +1188,18 @@ class SolarWind:
             df["day"] = df["time"].dt.date
             daily_avg = df.groupby("day").mean(numeric_only=True).reset_index()
 
-            formatted_data = []
-            for _, row in daily_avg.iterrows():
-                ghi = None
-                if not np.isnan(row["direct"]) and not np.isnan(row["diffuse"]):
-                    ghi = row["direct"] + row["diffuse"]
-                elif not np.isnan(row["shortwave"]):
-                    ghi = row["shortwave"]
-
-                formatted_data.append({
-                    "date": str(row["day"]),
-                    "direct_radiation": round(row["direct"], 2) if not np.isnan(row["direct"]) else None,
-                    "diffuse_radiation": round(row["diffuse"], 2) if not np.isnan(row["diffuse"]) else None,
-                    "direct_normal_irradiance": round(row["dni"], 2) if not np.isnan(row["dni"]) else None,
-                    "shortwave_radiation": round(row["shortwave"], 2) if not np.isnan(row["shortwave"]) else None,
-                    "global_horizontal_irradiance": round(ghi, 2) if ghi is not None else None
-                })
-
-            formatted_solar["data"] = formatted_data
+            # GHI is direct + diffuse where both are known, otherwise the
+            # shortwave radiation; computed for all days at once
+            direct, diffuse = daily_avg["direct"].to_numpy(), daily_avg["diffuse"].to_numpy()
+            ghi = np.where(np.isnan(direct) | np.isnan(diffuse), daily_avg["shortwave"].to_numpy(), direct + diffuse)
+
+            formatted_solar["data"] = _daily_records(daily_avg["day"], {
+                "direct_radiation": direct,
+                "diffuse_radiation": diffuse,
+                "direct_normal_irradiance": daily_avg["dni"],
+                "shortwave_radiation": daily_avg["shortwave"],
+                "global_horizontal_irradiance": ghi
+            })
             return formatted_solar
 
             
@@ -951,12 +1207,13 @@ class SolarWind:
             raise ValueError(f"Error formatting solar data: {str(e)}")
     
     @staticmethod
-    def _format_wind_data(wind_data):
+    def _format_wind_data(wind_data, now_iso=None):
         """
         Format wind data into a standardized structure.
         
         Args:
             wind_data (dict): Wind data
+            now_iso (str, optional): Timestamp to record. Defaults to the current time.
         
         Returns:
             dict: Formatted wind data
@@ -969,7 +1226,7 @@ class SolarWind:
             formatted_wind = {
                 "metadata": {
                     "source": wind_data.get("data_source", "Open-Meteo API"),
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now_iso or datetime.now().isoformat(),
                     "timezone": wind_data.get("timezone", "GMT"),
                     "timezone_abbreviation": wind_data.get("timezone_abbreviation", "GMT"),
                     "elevation": wind_data.get("elevation", None)
@@ -994,11 +1251,11 @@ class SolarWind:
             
             # Extract hourly data
             times = wind_data["hourly"]["time"]
-            ws10 = np.array(wind_data["hourly"].get("wind_speed_10m", [np.nan]*len(times)))
-            ws100 = np.array(wind_data["hourly"].get("wind_speed_100m", [np.nan]*len(times)))
-            wd10 = np.array(wind_data["hourly"].get("wind_direction_10m", [np.nan]*len(times)))
-            wd100 = np.array(wind_data["hourly"].get("wind_direction_100m", [np.nan]*len(times)))
-            gust = np.array(wind_data["hourly"].get("wind_gusts_10m", [np.nan]*len(times)))
+            ws10 = np.asarray(wind_data["hourly"].get("wind_speed_10m", [np.nan]*len(times)), dtype=float)
+            ws100 = np.asarray(wind_data["hourly"].get("wind_speed_100m", [np.nan]*len(times)), dtype=float)
+            wd10 = np.asarray(wind_data["hourly"].get("wind_direction_10m", [np.nan]*len(times)), dtype=float)
+            wd100 = np.asarray(wind_data["hourly"].get("wind_direction_100m", [np.nan]*len(times)), dtype=float)
+            gust = np.asarray(wind_data["hourly"].get("wind_gusts_10m", [np.nan]*len(times)), dtype=float)
 
             df = pd.DataFrame({
                 "time": pd.to_datetime(times),
@@ -1011,18 +1268,13 @@ class SolarWind:
             df["day"] = df["time"].dt.date
             daily_avg = df.groupby("day").mean(numeric_only=True).reset_index()
 
-            formatted_data = []
-            for _, row in daily_avg.iterrows():
-                formatted_data.append({
-                    "date": str(row["day"]),
-                    "wind_speed_10m": round(row["ws10"], 2) if not np.isnan(row["ws10"]) else None,
-                    "wind_speed_100m": round(row["ws100"], 2) if not np.isnan(row["ws100"]) else None,
-                    "wind_direction_10m": round(row["wd10"], 2) if not np.isnan(row["wd10"]) else None,
-                    "wind_direction_100m": round(row["wd100"], 2) if not np.isnan(row["wd100"]) else None,
-                    "wind_gusts_10m": round(row["gust"], 2) if not np.isnan(row["gust"]) else None
-                })
-
-            formatted_wind["data"] = formatted_data
+            formatted_wind["data"] = _daily_records(daily_avg["day"], {
+                "wind_speed_10m": daily_avg["ws10"],
+                "wind_speed_100m": daily_avg["ws100"],
+                "wind_direction_10m": daily_avg["wd10"],
+                "wind_direction_100m": daily_avg["wd100"],
+                "wind_gusts_10m": daily_avg["gust"]
+            })
             return formatted_wind
 
         except Exception as e:
@@ -1065,8 +1317,13 @@ class SolarWind:
             ValueError: If there's an error saving the file
         """
         try:
-            with open(file_path, 'w') as f:
-                json.dump(data, f, indent=2)
+            if _orjson_dumps is not None:
+                # One C-level encode of the whole document, NumPy values included
+                with open(file_path, 'wb') as f:
+                    f.write(_orjson_dumps(data, option=OPT_INDENT_2 | OPT_SERIALIZE_NUMPY))
+            else:
+                with open(file_path, 'w') as f:
+                    json.dump(data, f, indent=2)
         except Exception as e:
             raise ValueError(f"Error saving data to file: {str(e)}")
 
@@ -1078,49 +1335,49 @@ class SolarWind:
             if not records:
                 raise ValueError("No solar irradiance data available for visualization")
 
-            df = pd.DataFrame(records)
-            # parse timestamp
-            if "date" in df.columns:
-                df["timestamp"] = pd.to_datetime(df["date"])
-            elif "time" in df.columns:
-                df["timestamp"] = pd.to_datetime(df["time"])
-            else:
-                raise ValueError("No date/time column found in solar data")
-
             location_name = json_data.get("location", {}).get("name", "Unknown Location")
 
-            plt.figure(figsize=(12, 8))
-            plt.subplot(2, 1, 1)
-            plt.plot(df["timestamp"], df.get("global_horizontal_irradiance", []), label='GHI')
-            plt.title(f'Solar Irradiance for {location_name}')
-            plt.ylabel('W/m²')
-            plt.grid(alpha=0.3)
-            plt.legend()
-            plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-            plt.gcf().autofmt_xdate()
-
-            plt.subplot(2, 1, 2)
+            # Files are always written; only the base64 result is cached
+            cache_key = None if output_file else _render_key("solar", location_name, records)
+            if cache_key is not None:
+                cached = _render_cache_get(cache_key)
+                if cached is not None:
+                    return cached
+
+            df = _records_frame(records, "solar")
+
+            fig = Figure(figsize=(12, 8))
+            FigureCanvasAgg(fig)
+            ax = fig.add_subplot(2, 1, 1)
+            ax.plot(df["timestamp"], df.get("global_horizontal_irradiance", []), label='GHI')
+            ax.set_title(f'Solar Irradiance for {location_name}')
+            ax.set_ylabel('W/m²')
+            ax.grid(alpha=0.3)
+            ax.legend()
+            ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+            fig.autofmt_xdate()
+
+            ax = fig.add_subplot(2, 1, 2)
             if "direct_radiation" in df.columns:
-                plt.plot(df["timestamp"], df["direct_radiation"], label='Direct')
+                ax.plot(df["timestamp"], df["direct_radiation"], label='Direct')
             if "diffuse_radiation" in df.columns:
-                plt.plot(df["timestamp"], df["diffuse_radiation"], label='Diffuse')
-            plt.xlabel('Date')
-            plt.ylabel('W/m²')
-            plt.grid(alpha=0.3)
-            plt.legend()
-            plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-            plt.gcf().autofmt_xdate()
+                ax.plot(df["timestamp"], df["diffuse_radiation"], label='Diffuse')
+            ax.set_xlabel('Date')
+            ax.set_ylabel('W/m²')
+            ax.grid(alpha=0.3)
+            ax.legend()
+            ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+            fig.autofmt_xdate()
 
             if output_file:
-                plt.savefig(output_file, dpi=300, bbox_inches='tight')
-                plt.close()
+                fig.savefig(output_file, dpi=300, bbox_inches='tight')
                 return output_file
             else:
                 buf = BytesIO()
-                plt.savefig(buf, format='png', dpi=300, bbox_inches='tight')
-                plt.close()
-                buf.seek(0)
-                return base64.b64encode(buf.read()).decode('utf-8')
+                fig.savefig(buf, format='png', dpi=INLINE_FIGURE_DPI, bbox_inches='tight')
+                encoded = base64.b64encode(buf.getbuffer()).decode('ascii')
+                _render_cache_set(cache_key, encoded)
+                return encoded
 
         except Exception as e:
             raise ValueError(f"Error creating solar visualization: {e}")
@@ -1132,45 +1389,46 @@ class SolarWind:
             if not records:
                 raise ValueError("No wind data available for visualization")
 
-            df = pd.DataFrame(records)
-            if "date" in df.columns:
-                df["timestamp"] = pd.to_datetime(df["date"])
-            elif "time" in df.columns:
-                df["timestamp"] = pd.to_datetime(df["time"])
-            else:
-                raise ValueError("No date/time column found in wind data")
-
             location_name = json_data.get("location", {}).get("name", "Unknown Location")
 
-            plt.figure(figsize=(12, 8))
-            plt.subplot(2, 1, 1)
-            plt.plot(df["timestamp"], df.get("wind_speed_10m", []), label='Speed 10m')
+            cache_key = None if output_file else _render_key("wind", location_name, records)
+            if cache_key is not None:
+                cached = _render_cache_get(cache_key)
+                if cached is not None:
+                    return cached
+
+            df = _records_frame(records, "wind")
+
+            fig = Figure(figsize=(12, 8))
+            FigureCanvasAgg(fig)
+            ax = fig.add_subplot(2, 1, 1)
+            ax.plot(df["timestamp"], df.get("wind_speed_10m", []), label='Speed 10m')
             if "wind_speed_100m" in df.columns:
-                plt.plot(df["timestamp"], df["wind_speed_100m"], label='Speed 100m')
-            plt.title(f'Wind Speed for {location_name}')
-            plt.ylabel('m/s')
-            plt.grid(alpha=0.3)
-            plt.legend()
-            plt.gca().xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-            plt.gcf().autofmt_xdate()
-
-            plt.subplot(2, 1, 2)
+                ax.plot(df["timestamp"], df["wind_speed_100m"], label='Speed 100m')
+            ax.set_title(f'Wind Speed for {location_name}')
+            ax.set_ylabel('m/s')
+            ax.grid(alpha=0.3)
+            ax.legend()
+            ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+            fig.autofmt_xdate()
+
+            ax = fig.add_subplot(2, 1, 2)
             if "wind_direction_10m" in df.columns:
-                plt.scatter(df["timestamp"], df["wind_direction_10m"], s=20)
-            plt.xlabel('Date')
-            plt.ylabel('°')
-            plt.grid(alpha=0.3)
+                # One image instead of a path per marker in vector (PDF/SVG) files
+                ax.scatter(df["timestamp"], df["wind_direction_10m"], s=20, rasterized=True)
+            ax.set_xlabel('Date')
+            ax.set_ylabel('°')
+            ax.grid(alpha=0.3)
 
             if output_file:
-                plt.savefig(output_file, dpi=300, bbox_inches='tight')
-                plt.close()
+                fig.savefig(output_file, dpi=300, bbox_inches='tight')
                 return output_file
             else:
                 buf = BytesIO()
-                plt.savefig(buf, format='png', dpi=300, bbox_inches='tight')
-                plt.close()
-                buf.seek(0)
-                return base64.b64encode(buf.read()).decode('utf-8')
+                fig.savefig(buf, format='png', dpi=INLINE_FIGURE_DPI, bbox_inches='tight')
+                encoded = base64.b64encode(buf.getbuffer()).decode('ascii')
+                _render_cache_set(cache_key, encoded)
+                return encoded
 
         except Exception as e:
             raise ValueError(f"Error creating wind visualization: {e}")
@@ -1187,52 +1445,58 @@ class SolarWind:
 
             location_name = json_data.get("location", {}).get("name", "Unknown")
 
+            cache_key = None if output_file else _render_key("assessment", location_name, assessment)
+            if cache_key is not None:
+                cached = _render_cache_get(cache_key)
+                if cached is not None:
+                    return cached
+
             solar = assessment.get("solar_energy")
             if isinstance(solar, str): solar = json.loads(solar)
             wind = assessment.get("wind_energy")
             if isinstance(wind, str): wind = json.loads(wind)
 
-            suit_map = {"Excellent":4, "Good":3, "Moderate":2, "Poor":1, "Unsuitable":0, "Unknown":0}
-            vals = [suit_map.get(solar.get("suitability"), 0), suit_map.get(wind.get("suitability"), 0)]
+            scores = SolarWind._SUITABILITY_SCORE
+            vals = [scores.get(solar.get("suitability"), 0), scores.get(wind.get("suitability"), 0)]
             cats = ["Solar","Wind"]
             N = len(cats)
             angles = [n/float(N)*2*np.pi for n in range(N)] + [0]
             vals += vals[:1]
 
-            plt.figure(figsize=(12,10))
-            ax = plt.subplot(2,2,1, polar=True)
-            plt.xticks(angles[:-1], cats)
+            fig = Figure(figsize=(12,10))
+            FigureCanvasAgg(fig)
+            ax = fig.add_subplot(2,2,1, polar=True)
+            ax.set_xticks(angles[:-1], cats)
             ax.set_rlabel_position(0)
-            plt.yticks([1,2,3,4], ["Poor","Moderate","Good","Excellent"], size=8)
-            plt.ylim(0,4)
+            ax.set_yticks([1,2,3,4], ["Poor","Moderate","Good","Excellent"], size=8)
+            ax.set_ylim(0,4)
             ax.plot(angles, vals, linewidth=2)
             ax.fill(angles, vals, alpha=0.1)
-            plt.title("Suitability")
+            ax.set_title("Suitability")
 
-            plt.subplot(2,2,2)
+            ax = fig.add_subplot(2,2,2)
             prods = [solar.get("estimated_annual_production",0), wind.get("estimated_annual_production",0)]
-            bars = plt.bar(cats, prods)
+            bars = ax.bar(cats, prods)
             for b in bars:
                 h = b.get_height()
-                plt.text(b.get_x()+b.get_width()/2, h*1.01, str(int(h)), ha='center')
-            plt.title("Annual Production (kWh/kW)")
+                ax.text(b.get_x()+b.get_width()/2, h*1.01, str(int(h)), ha='center')
+            ax.set_title("Annual Production (kWh/kW)")
 
             overall = assessment.get("overall_recommendation","None")
-            plt.figtext(0.5,0.01,f"Overall: {overall}", ha='center')
+            fig.text(0.5,0.01,f"Overall: {overall}", ha='center')
 
-            plt.suptitle(f"Renewable Assessment for {location_name}")
-            plt.tight_layout(rect=[0,0.05,1,0.95])
+            fig.suptitle(f"Renewable Assessment for {location_name}")
+            fig.tight_layout(rect=[0,0.05,1,0.95])
 
             if output_file:
-                plt.savefig(output_file, dpi=300, bbox_inches='tight')
-                plt.close()
+                fig.savefig(output_file, dpi=300, bbox_inches='tight')
                 return output_file
             else:
                 buf = BytesIO()
-                plt.savefig(buf, format='png', dpi=300, bbox_inches='tight')
-                plt.close()
-                buf.seek(0)
-                return base64.b64encode(buf.read()).decode('utf-8')
+                fig.savefig(buf, format='png', dpi=INLINE_FIGURE_DPI, bbox_inches='tight')
+                encoded = base64.b64encode(buf.getbuffer()).decode('ascii')
+                _render_cache_set(cache_key, encoded)
+                return encoded
 
         except Exception as e:
             raise ValueError(f"Error creating potential visualization: {e}")
@@ -1,9 +1,11 @@
-import yfinance as yf
 from typing import Annotated, Callable, Any, Optional
 from pandas import DataFrame
 from functools import wraps
 
-from ..utils import save_output, SavePathType, decorate_all_methods
+from ..utils import save_output, SavePathType, decorate_all_methods, lazy_import
+
+# yfinance is only needed once a ticker is actually queried
+yf = lazy_import("yfinance")
 
 
 def init_ticker(func: Callable) -> Callable:
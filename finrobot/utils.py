@@ -1,5 +1,7 @@
 import os
+import sys
 import json
+import importlib.util
 import pandas as pd
 from datetime import date, timedelta, datetime
 from typing import Annotated
@@ -45,6 +47,21 @@ def decorate_all_methods(decorator):
     return class_decorator
 
 
+def lazy_import(name):
+    """Import a module whose body only executes on first attribute access."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
 def get_next_weekday(date):
 
     if not isinstance(date, datetime):